@@ -8,15 +8,20 @@ import concurrent.futures
 import logging
 import os
 import sys
-import time
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, TextIO, Tuple, Union
 
 from ..io.fasta import FASTALoader
+from ..io.sts import STSLoader
 from .models import FASTARecord, STSHit, STSRecord, ThreadData
+from .utils import encode_sequence, find_words, hash_value, hash_words
 
 # Constants
 AMBIG = 100
 MIN_FILESIZE_FOR_THREADING = 100000
+# Up to this many distinct hash words, searching for each word with str.find
+# beats hashing every window of the sequence
+MAX_WORDS_FOR_FIND = 256
 
 # Default parameters
 DEFAULT_MARGIN = 50
@@ -41,6 +46,22 @@ MAX_PCR_SIZE = 10000
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _compare_masks(length: int, protected: int) -> Tuple[int, int, int]:
+    """
+    Build the bit masks for comparing packed sequences of the given length.
+
+    Returns:
+        Tuple of (low bit of every base, 3' bases on '+', 3' bases on '-'),
+        where the 3' region is the last ``protected`` bases on '+' (low bits)
+        and the first ones on '-'.
+    """
+    base_mask = (4**length - 1) // 3
+    forward_mask = (1 << (2 * protected)) - 1
+    reverse_mask = forward_mask << (2 * (length - protected))
+    return base_mask, forward_mask, reverse_mask
+
+
 class MerPCR:
     """Main merPCR class that handles all the e-PCR functionality."""
 
@@ -67,16 +88,16 @@ class MerPCR:
 
         # Storage for loaded data
         self.sts_records = []
-        self.sts_table = {}  # Hash table for STS lookup
+        self.sts_table = {}  # Hash table for STS lookup (hash -> tuple of records)
         self.max_pcr_size = 0
         self.total_hits = 0
 
+        # Validate parameters before building tables that depend on them
+        self._validate_parameters()
+
         # Initialize lookup tables
         self._init_lookup_tables()
 
-        # Validate parameters
-        self._validate_parameters()
-
     def _validate_parameters(self):
         """Validate input parameters."""
         if not (MIN_WORDSIZE <= self.wordsize <= MAX_WORDSIZE):
@@ -134,6 +155,12 @@ class MerPCR:
             self.compl[k] = v
             self.compl[k.lower()] = v.lower()
 
+        # Byte-indexed complement table; anything without a complement becomes N
+        compl_table = bytearray(b"N" * 256)
+        for base, complement in self.compl.items():
+            compl_table[ord(base)] = ord(complement)
+        self.compl_table = bytes(compl_table)
+
         # IUPAC ambiguity table
         self.iupac_mapping = {
             "A": "A",
@@ -190,183 +217,56 @@ class MerPCR:
         for base in "BDHKMNRSVWXYbdhkmnrsvwxy":
             self.ambig[base] = True
 
-    def load_sts_file(self, filename: str) -> bool:
-        """Load STS records from a tab-delimited file."""
-        start_time = time.time()
-        file_size = os.path.getsize(filename)
-
-        if file_size == 0:
-            logger.error(f"STS file '{filename}' is empty")
-            return False
-
-        logger.info(f"Reading STS file: {filename}")
-
+    def load_sts_file(self, filename: Union[str, os.PathLike, TextIO]) -> bool:
+        """Load STS records from a tab-delimited file path or open text stream."""
         self.sts_records = []
         self.sts_table = {}
         self.max_pcr_size = 0
 
-        bad_primers_short = 0
-        bad_primers_ambig = 0
-        bad_pcr_size = 0
-
-        with open(filename, "r") as file:
-            lines = file.readlines()
-            line_no = 0
-
-            for line in lines:
-                line_no += 1
-                line = line.strip()
-
-                # Skip comments and blank lines
-                if not line or line.startswith("#"):
-                    continue
-
-                # Parse tab-delimited fields
-                fields = line.split("\t")
-                if len(fields) < 4:
-                    logger.error(
-                        f"Bad STS file format at line {line_no}. Expected at least 4 fields."
-                    )
-                    return False
-
-                sts_id = fields[0]
-                primer1 = fields[1].upper()
-                primer2 = fields[2].upper()
-
-                # Parse PCR size
-                pcr_size = self._parse_pcr_size(fields[3])
-                alias = fields[4] if len(fields) > 4 else ""
-
-                # Check if primer length and PCR size are valid
-                if len(primer1) < self.wordsize or len(primer2) < self.wordsize:
-                    bad_primers_short += 1
-                    continue
-
-                if len(primer1) + len(primer2) > pcr_size:
-                    bad_pcr_size += 1
-                    pcr_size = len(primer1) + len(primer2)
-
-                # Keep track of the maximum PCR size
-                if pcr_size > self.max_pcr_size:
-                    self.max_pcr_size = pcr_size
-
-                # Create STS record for forward direction
-                sts = STSRecord(
-                    id=sts_id,
-                    primer1=primer1,
-                    primer2=primer2,
-                    pcr_size=pcr_size,
-                    alias=alias,
-                    offset=line_no,
-                    direct="+",
-                )
-
-                # Forward primer hash
-                hash_offset1, hash_value1 = self._hash_value(primer1)
-                if hash_offset1 >= 0:
-                    sts_for = STSRecord(**{**vars(sts), "hash_offset": hash_offset1, "direct": "+"})
-                    self._insert_sts(sts_for, hash_value1)
-                else:
-                    bad_primers_ambig += 1
-
-                # Reverse direction: search for primer2 (forward) followed by primer1_rc
-                rev_primer1 = self._reverse_complement(primer1)
-                hash_offset2, hash_value2 = self._hash_value(primer2)
-                if hash_offset2 >= 0:
-                    sts_rev = STSRecord(**{**vars(sts), "hash_offset": hash_offset2, "direct": "-"})
-                    sts_rev.primer1 = primer2
-                    sts_rev.primer2 = rev_primer1
-                    self._insert_sts(sts_rev, hash_value2)
-                else:
-                    bad_primers_ambig += 1
-
-        # Report statistics
-        if bad_primers_short > 0:
-            logger.warning(
-                f"{bad_primers_short} STSs have primer shorter than word size ({self.wordsize}): not included in search"
-            )
-
-        if bad_primers_ambig > 0:
-            logger.warning(
-                f"{bad_primers_ambig} primers have ambiguities which prevent computation of a hash value: not included in search"
-            )
-
-        if bad_pcr_size > 0:
-            logger.warning(
-                f"{bad_pcr_size} STSs have a primer length sum greater than the pcr size: expected pcr size adjusted"
-            )
+        loader = STSLoader(self.wordsize, self.margin, self.default_pcr_size, self.threads)
+        if hasattr(filename, "read"):
+            result = loader.load_stream(filename)
+        else:
+            result = loader.load_file(filename)
+        if result is None:
+            return False
 
-        logger.info(
-            f"Loaded {len(self.sts_records)} STS records in {time.time() - start_time:.2f} seconds"
-        )
+        self.sts_records, self.sts_table, self.max_pcr_size = result
         return True
 
-    def _parse_pcr_size(self, pcr_size_str: str) -> int:
-        """Parse PCR size from string, handling ranges."""
-        if "-" in pcr_size_str:
-            try:
-                size_range = pcr_size_str.split("-")
-                if len(size_range) == 2 and size_range[0] and size_range[1]:
-                    low = int(size_range[0])
-                    high = int(size_range[1])
-                    return (low + high) // 2
-                else:
-                    return self.default_pcr_size
-            except ValueError:
-                return self.default_pcr_size
-        else:
-            try:
-                pcr_size = int(pcr_size_str)
-                return pcr_size if pcr_size > 0 else self.default_pcr_size
-            except ValueError:
-                return self.default_pcr_size
-
-    def _insert_sts(self, sts: STSRecord, hash_value: int):
-        """Insert an STS record into the hash table."""
-        if hash_value not in self.sts_table:
-            self.sts_table[hash_value] = []
-        self.sts_table[hash_value].append(sts)
-        self.sts_records.append(sts)
-
     def _hash_value(self, primer: str) -> tuple[int, int]:
         """Compute a hash value for the specified primer."""
-        primer = primer.upper()
-        primer_len = len(primer)
-        if primer_len < self.wordsize:
-            return -1, 0
-
-        # Try all possible positions for the hash word
-        for offset in range(primer_len - self.wordsize + 1):
-            hash_value = 0
-            valid_hash = True
-
-            for i in range(self.wordsize):
-                base = primer[offset + i]
-                code = self.scode[ord(base)]
-                if code == AMBIG:
-                    valid_hash = False
-                    break
-
-                hash_value = (hash_value << 2) | code
-
-            if valid_hash:
-                return offset, hash_value
-
-        return -1, 0
+        return hash_value(primer, self.wordsize)
 
     def _reverse_complement(self, sequence: str) -> str:
         """Return the reverse complement of a DNA sequence."""
-        return "".join(self.compl.get(base, "N") for base in reversed(sequence))
-
-    def load_fasta_file(self, filename: str) -> List[FASTARecord]:
-        """Load sequences from a FASTA file."""
+        # Non-ASCII characters become "?", which the table complements to N
+        complement = sequence.encode("ascii", "replace").translate(self.compl_table)
+        return complement[::-1].decode("ascii")
+
+    def load_fasta_file(self, filename: Union[str, os.PathLike, TextIO]) -> List[FASTARecord]:
+        """Load sequences from a FASTA file path or open text stream."""
+        if hasattr(filename, "read"):
+            return FASTALoader.load_stream(filename)
         return FASTALoader.load_file(filename)
 
-    def search(self, fasta_records: List[FASTARecord], output_file: str = None) -> int:
-        """Search for STS markers in the provided FASTA sequences."""
+    def search(
+        self,
+        fasta_records: List[FASTARecord],
+        output_file: Union[str, os.PathLike, TextIO, None] = None,
+    ) -> int:
+        """Search for STS markers in the provided FASTA sequences.
+
+        Hits are written to ``output_file``, which may be a path, an open
+        writable text stream (left open), or None/"stdout" for standard output.
+        """
         total_hits = 0
-        if output_file and output_file.lower() != "stdout":
+        close_output = False
+        if hasattr(output_file, "write"):
+            output = output_file
+        elif output_file and os.fspath(output_file).lower() != "stdout":
             output = open(output_file, "w")
+            close_output = True
         else:
             output = sys.stdout
 
@@ -413,10 +313,14 @@ class MerPCR:
             # Execute search in parallel
             if num_threads > 1:
                 with concurrent.futures.ProcessPoolExecutor(max_workers=num_threads) as executor:
-                    futures = [executor.submit(self._process_thread, data) for data in thread_data]
+                    futures = [executor.submit(self._search_chunk, data) for data in thread_data]
                     for future in concurrent.futures.as_completed(futures):
-                        result = future.result()
-                        thread_data[result.thread_id] = result
+                        thread_id, chunk_hits = future.result()
+                        # Resolve record indexes against our own records, not worker copies
+                        thread_data[thread_id].hits = [
+                            STSHit(pos1=pos1, pos2=pos2, sts=self.sts_records[index])
+                            for pos1, pos2, index in chunk_hits
+                        ]
             else:
                 # Single thread version
                 thread_data[0] = self._process_thread(thread_data[0])
@@ -425,8 +329,9 @@ class MerPCR:
             hits = []
             for i, data in enumerate(thread_data):
                 for hit in data.hits:
-                    # Skip redundant hits (those that appear in the overlap region)
-                    if data.offset > 0 and hit.pos2 < overlap and i > 0:
+                    # Skip redundant hits ending within the overlap with the previous chunk,
+                    # which that chunk has already found
+                    if i > 0 and hit.pos2 - data.offset < overlap:
                         continue
                     hits.append(hit)
 
@@ -443,64 +348,52 @@ class MerPCR:
                 print(output_line, file=output)
                 total_hits += 1
 
-        if output_file and output_file.lower() != "stdout":
+        if close_output:
             output.close()
 
         logger.info(f"Total hits found: {total_hits}")
         self.total_hits = total_hits
         return total_hits
 
+    def _search_chunk(self, thread_data: ThreadData) -> Tuple[int, List[Tuple[int, int, int]]]:
+        """
+        Search one chunk in a worker process.
+
+        Returns:
+            Tuple of (thread_id, hits), with each hit as (pos1, pos2, index of
+            its STS in sts_records). This keeps the chunk sequence and record
+            copies out of the result sent back to the parent process.
+        """
+        record_index = {id(sts): index for index, sts in enumerate(self.sts_records)}
+        hits = self._process_thread(thread_data).hits
+        return thread_data.thread_id, [
+            (hit.pos1, hit.pos2, record_index[id(hit.sts)]) for hit in hits
+        ]
+
     def _process_thread(self, thread_data: ThreadData) -> ThreadData:
         """Process a single thread's worth of sequence data."""
         sequence = thread_data.sequence.upper()
         seq_len = len(sequence)
 
-        if seq_len <= self.wordsize:
+        # Every probe would miss an empty table, so skip the scan entirely
+        if seq_len <= self.wordsize or not self.sts_table:
             return thread_data
 
-        # Slide a window of wordsize along the sequence
-        p = 0
-        h = 0
-        N = 0  # Number of ambiguous bases in current window
-
-        # Initialize the hash with the first wordsize bases
-        for i in range(self.wordsize):
-            h = h << 2
-            if p + i >= seq_len:
-                break
+        # Find the words in the table: each one directly for small tables,
+        # otherwise by probing the table with the hash of every window
+        sts_table = self.sts_table
+        if len(sts_table) <= MAX_WORDS_FOR_FIND:
+            words = find_words(sequence, sts_table, self.wordsize)
+        else:
+            words = ((pos, h) for pos, h in hash_words(sequence, self.wordsize) if h in sts_table)
 
-            code = self.scode[ord(sequence[p + i])]
-            if code == AMBIG:
-                N = self.wordsize
-            else:
-                if N > 0:
-                    N -= 1
-                h |= code
-
-        # Slide the window along the sequence
-        for pos in range(seq_len - self.wordsize + 1):
-            # Check if current window has a valid hash (no ambiguities)
-            if N == 0 and h in self.sts_table:
-                for sts in self.sts_table[h]:
-                    # Verify sequence match at hash position
-                    k = pos - sts.hash_offset
-                    if k >= 0 and k + len(sts.primer1) <= seq_len:
-                        # Try to match this STS
-                        self._match_sts(sequence, seq_len, k, sts, thread_data)
-
-            # Shift the window by one position
-            if pos + self.wordsize < seq_len:
-                # Remove leftmost base from hash
-                h = (h << 2) & ((1 << (2 * self.wordsize)) - 1)
-
-                # Add new rightmost base to hash
-                code = self.scode[ord(sequence[pos + self.wordsize])]
-                if code == AMBIG:
-                    N = self.wordsize
-                else:
-                    if N > 0:
-                        N -= 1
-                    h |= code
+        for pos, h in words:
+            for sts in sts_table[h]:
+                # Verify sequence match at hash position
+                k = pos - sts.hash_offset
+                if k >= 0 and k + len(sts.primer1) <= seq_len:
+                    # Try to match this STS
+                    self._match_sts(sequence, seq_len, k, sts, thread_data)
 
         return thread_data
 
@@ -512,7 +405,9 @@ class MerPCR:
         len_p1 = len(primer1)
 
         # Check if the whole primer matches (not just the hash word)
-        if k + len_p1 <= seq_len and self._compare_seqs(sequence[k : k + len_p1], primer1, "+"):
+        if k + len_p1 <= seq_len and self._compare_seqs(
+            sequence[k : k + len_p1], primer1, "+", sts.primer1_code
+        ):
             primer2 = sts.primer2
             len_p2 = len(primer2)
             exp_size = sts.pcr_size
@@ -539,104 +434,149 @@ class MerPCR:
             if lo_margin < 0:
                 lo_margin = 0
 
-            # Try the expected position first
-            p2_pos = k + exp_size - len_p2
-
-            # Ensure p2_pos is valid
-            if k + len_p1 <= p2_pos and p2_pos + len_p2 <= seq_len:
-                if self._compare_seqs(sequence[p2_pos : p2_pos + len_p2], primer2, "-"):
-                    actual_product_size = (p2_pos + len_p2) - k
-                    thread_data.hits.append(
-                        STSHit(
-                            pos1=k + thread_data.offset,
-                            pos2=k + actual_product_size - 1 + thread_data.offset,
-                            sts=sts,
-                        )
-                    )
-                    count = 1
-                else:
-                    count = 0
+            # Search for the second primer within the margins around its expected
+            # position. Positions below it must also leave room for the first primer.
+            expected_pos = k + exp_size - len_p2
+            if expected_pos < k + len_p1:
+                start = expected_pos + 1
             else:
-                count = 0
-
-            # Try positions within the margin
-            for i in range(1, self.margin + 1):
-                # Try lower margin
-                if i <= lo_margin:
-                    p2_pos = k + exp_size - len_p2 - i
-                    # Ensure second primer is after first primer
-                    if k + len_p1 <= p2_pos and p2_pos + len_p2 <= seq_len:
-                        if self._compare_seqs(sequence[p2_pos : p2_pos + len_p2], primer2, "-"):
-                            actual_product_size = (p2_pos + len_p2) - k
-                            thread_data.hits.append(
-                                STSHit(
-                                    pos1=k + thread_data.offset,
-                                    pos2=k + actual_product_size - 1 + thread_data.offset,
-                                    sts=sts,
-                                )
-                            )
-                            count += 1
-
-                # Try higher margin
-                if i <= hi_margin:
-                    p2_pos = k + exp_size - len_p2 + i
-                    if p2_pos + len_p2 <= seq_len:
-                        if self._compare_seqs(sequence[p2_pos : p2_pos + len_p2], primer2, "-"):
-                            actual_product_size = (p2_pos + len_p2) - k
-                            thread_data.hits.append(
-                                STSHit(
-                                    pos1=k + thread_data.offset,
-                                    pos2=k + actual_product_size - 1 + thread_data.offset,
-                                    sts=sts,
-                                )
-                            )
-                            count += 1
+                start = max(k + len_p1, expected_pos - lo_margin)
+            stop = min(expected_pos + hi_margin, seq_len - len_p2)
+
+            positions = self._matching_positions(
+                sequence, max(start, 0), stop, primer2, sts.primer2_code
+            )
+            # Report the nearest positions first, the lower one before the higher
+            positions.sort(key=lambda pos: 2 * abs(pos - expected_pos) - (pos < expected_pos))
+
+            count = 0
+            for p2_pos in positions:
+                actual_product_size = (p2_pos + len_p2) - k
+                thread_data.hits.append(
+                    STSHit(
+                        pos1=k + thread_data.offset,
+                        pos2=k + actual_product_size - 1 + thread_data.offset,
+                        sts=sts,
+                    )
+                )
+                count += 1
 
             return count
 
         return 0
 
-    def _compare_seqs(self, seq1: str, seq2: str, strand: str) -> bool:
-        """Compare two sequences allowing for mismatches."""
+    def _matching_positions(
+        self, sequence: str, start: int, stop: int, primer: str, code: int
+    ) -> List[int]:
+        """Return the positions from start to stop where a reverse-strand primer matches."""
+        primer_len = len(primer)
+        if start > stop:
+            return []
+
+        if code >= 0 and not self.iupac_mode:
+            # Pack the whole search window once and shift each candidate out of it
+            window_code = encode_sequence(sequence[start : stop + primer_len])
+            if window_code >= 0:
+                # Same test as _compare_codes, inlined as this loop runs for every margin position
+                mask = (1 << (2 * primer_len)) - 1
+                base_mask, _, protect_mask = _compare_masks(
+                    primer_len, min(self.three_prime_match, primer_len)
+                )
+                mismatches = self.mismatches
+                matches = []
+                shift = 2 * (stop - start)
+                for pos in range(start, stop + 1):
+                    diff = ((window_code >> shift) & mask) ^ code
+                    shift -= 2
+                    if diff:
+                        if not mismatches:
+                            continue
+                        diff = (diff | (diff >> 1)) & base_mask
+                        if diff & protect_mask or diff.bit_count() > mismatches:
+                            continue
+                    matches.append(pos)
+                return matches
+
+        return [
+            pos
+            for pos in range(start, stop + 1)
+            if self._compare_seqs(sequence[pos : pos + primer_len], primer, "-", code)
+        ]
+
+    def _compare_seqs(self, seq1: str, seq2: str, strand: str, code2: Optional[int] = None) -> bool:
+        """
+        Compare two sequences allowing for mismatches.
+
+        Outside IUPAC mode, sequences made only of A/C/G/T are compared as packed
+        2-bit codes. ``code2`` may carry the precomputed code of ``seq2``
+        (-1 if it cannot be packed); otherwise it is computed on the fly.
+        """
         if len(seq1) != len(seq2):
             return False
 
-        mismatches = 0
+        if not self.iupac_mode:
+            if code2 is None:
+                code2 = encode_sequence(seq2)
+            if code2 >= 0:
+                code1 = encode_sequence(seq1)
+                if code1 >= 0:
+                    return self._compare_codes(code1, code2, len(seq1), strand)
+
+        # Fold case once up front rather than per character
+        seq1 = seq1.upper()
+        seq2 = seq2.upper()
         seq_len = len(seq1)
 
-        for i in range(seq_len):
-            # Check if the position is in the 3' protected region
-            in_3prime_protected = (strand == "+" and i >= seq_len - self.three_prime_match) or (
-                strand == "-" and i < self.three_prime_match
-            )
+        # The 3' protected region is the last bases on '+' and the first ones on '-'
+        if strand == "+":
+            protected_start, protected_end = seq_len - self.three_prime_match, seq_len
+        elif strand == "-":
+            protected_start, protected_end = 0, self.three_prime_match
+        else:
+            protected_start = protected_end = 0
 
-            # Use IUPAC comparison if enabled
-            if self.iupac_mode:
-                # Get the characters at this position
-                c1 = seq1[i].upper()
-                c2 = seq2[i].upper()
-
-                # Check if either character is in the ambiguity set
-                if c1 in self.iupac_mapping and c2 in self.iupac_mapping:
-                    # Get the expanded character sets
-                    set1 = set(self.iupac_mapping[c1])
-                    set2 = set(self.iupac_mapping[c2])
-
-                    # If the sets have any common elements, it's a match
-                    match = bool(set1.intersection(set2))
-                else:
-                    # If one of the characters isn't recognized, it's not a match
-                    match = c1 == c2
-            else:
-                match = seq1[i].upper() == seq2[i].upper()
+        # In IUPAC mode, bases whose possible interpretations overlap also match.
+        # The matrix only covers ASCII, so other characters must be identical.
+        iupac_match = self.iupac_match_matrix if self.iupac_mode else None
+        mismatches = 0
+
+        for i, (c1, c2) in enumerate(zip(seq1, seq2)):
+            if c1 == c2 or (
+                iupac_match is not None
+                and c1.isascii()
+                and c2.isascii()
+                and iupac_match[ord(c1)][ord(c2)]
+            ):
+                continue
 
-            if not match:
-                # No mismatches allowed in 3' protected region
-                if in_3prime_protected:
-                    return False
+            # No mismatches allowed in 3' protected region
+            if protected_start <= i < protected_end:
+                return False
 
-                mismatches += 1
-                if mismatches > self.mismatches:
-                    return False
+            mismatches += 1
+            if mismatches > self.mismatches:
+                return False
 
         return True
+
+    def _compare_codes(self, code1: int, code2: int, length: int, strand: str) -> bool:
+        """Compare two packed sequences of the given length allowing for mismatches."""
+        base_mask, forward_mask, reverse_mask = _compare_masks(
+            length, min(self.three_prime_match, length)
+        )
+
+        # Fold each 2-bit difference onto its low bit: one set bit per mismatching base
+        diff = code1 ^ code2
+        diff = (diff | (diff >> 1)) & base_mask
+
+        # Same 3' region as _compare_seqs: last bases on '+', first ones on '-', none otherwise
+        if strand == "+":
+            protected = forward_mask
+        elif strand == "-":
+            protected = reverse_mask
+        else:
+            protected = 0
+        if diff & protected:
+            return False
+
+        return diff.bit_count() <= self.mismatches
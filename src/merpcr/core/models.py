@@ -4,6 +4,7 @@ Data models for merPCR.
 
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 from typing import List
 
 
@@ -14,7 +15,7 @@ class SeqType(Enum):
     NUCLEOTIDE = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class STSRecord:
     """Class representing an STS record."""
 
@@ -27,29 +28,40 @@ class STSRecord:
     hash_offset: int = 0  # Offset of hash word within primer
     direct: str = "+"  # Orientation: '+' for forward, '-' for reverse
     ambig_primer: int = 0  # Flags indicating which primers have ambiguities
+    primer1_code: int = -1  # 2-bit packed primer1, -1 if not encodable
+    primer2_code: int = -1  # 2-bit packed primer2, -1 if not encodable
 
 
-@dataclass
+@dataclass(init=False)
 class FASTARecord:
-    """Class representing a FASTA sequence record."""
+    """Class representing a FASTA sequence record.
+
+    The label is parsed from the defline on first access, unless one is given.
+    """
 
     defline: str
     sequence: str
-    label: str = ""
 
-    def __post_init__(self):
-        """Extract the label from the defline if not provided."""
-        if not self.label:
-            if ">" in self.defline:
-                defline = self.defline.strip()[1:]  # Remove '>' character
-            else:
-                defline = self.defline.strip()
+    def __init__(self, defline: str, sequence: str, label: str = ""):
+        self.defline = defline
+        self.sequence = sequence
+        if label:
+            # Seed the cached property so the defline is never parsed
+            self.__dict__["label"] = label
+
+    @cached_property
+    def label(self) -> str:
+        """Extract the label as the first word in the defline."""
+        if ">" in self.defline:
+            defline = self.defline.strip()[1:]  # Remove '>' character
+        else:
+            defline = self.defline.strip()
 
-            # Extract label as the first word in the defline
-            self.label = defline.split()[0]
+        words = defline.split(None, 1)
+        return words[0] if words else ""
 
 
-@dataclass
+@dataclass(slots=True)
 class STSHit:
     """Class representing an STS hit in a sequence."""
 
@@ -58,7 +70,7 @@ class STSHit:
     sts: STSRecord
 
 
-@dataclass
+@dataclass(slots=True)
 class ThreadData:
     """Class for thread-specific search data."""
 
@@ -2,7 +2,8 @@
 Utility functions for merPCR.
 """
 
-from typing import Dict, Tuple
+import re
+from typing import Collection, Dict, Iterator, List, Tuple
 
 # Global constants
 AMBIG = 100  # Ambiguous base code
@@ -39,47 +40,143 @@ _compl = {
 for k, v in list(_compl.items()):
     _compl[k.lower()] = v.lower()
 
+# Base-4 digit table for packing sequences into 2-bit codes. Only A/C/G/T are
+# mapped; everything else (including U) becomes a non-digit so that packed
+# comparisons keep exact character semantics.
+_base4 = ["x"] * 256
+for _i, _base in enumerate("ACGT"):
+    _base4[ord(_base)] = _base4[ord(_base.lower())] = str(_i)
+_base4 = "".join(_base4)
+
+# Byte form of _scode for bytes.translate, with 4 marking ambiguous bases
+_hash_codes = bytes(4 if code == AMBIG else code for code in _scode)
+
+# Base-4 digit form of _scode for bytes.translate, with "x" marking ambiguous bases
+_hash_digits = bytes(ord("x") if code == AMBIG else ord("0") + code for code in _scode)
+
+# Byte form of _compl for bytes.translate, with N for every unknown symbol
+_compl_codes = bytearray(b"N" * 256)
+for _base, _complement in _compl.items():
+    _compl_codes[ord(_base)] = ord(_complement)
+_compl_codes = bytes(_compl_codes)
+
 
 def reverse_complement(sequence: str) -> str:
     """Return the reverse complement of a DNA sequence."""
-    return "".join(_compl.get(base, "N") for base in reversed(sequence))
+    # Non-ASCII characters become "?", which complements to N like any unknown symbol
+    codes = sequence.encode("ascii", "replace").translate(_compl_codes)
+    return codes[::-1].decode("ascii")
 
 
-def hash_value(primer: str, wordsize: int) -> Tuple[int, int]:
+def encode_sequence(sequence: str) -> int:
     """
-    Compute a hash value for the specified primer.
+    Pack a nucleotide sequence into an integer of 2-bit codes.
+
+    The first base occupies the most significant bits (A=0, C=1, G=2, T=3).
 
     Args:
-        primer: The primer sequence
+        sequence: The sequence to encode
+
+    Returns:
+        The packed code, or -1 if the sequence is empty or contains anything
+        other than A, C, G or T.
+    """
+    digits = sequence.translate(_base4)
+    # Non-ASCII digits pass through translate unchanged, so must be rejected here
+    if not (digits.isascii() and digits.isdigit()):
+        return -1
+    return int(digits, 4)
+
+
+def hash_words(sequence: str, wordsize: int) -> Iterator[Tuple[int, int]]:
+    """
+    Compute the hash value of every unambiguous word in a sequence.
+
+    The hash is rolled along the sequence, so each position costs one update
+    rather than a fresh pass over the word.
+
+    Args:
+        sequence: The sequence to scan
+        wordsize: Word size for hashing
+
+    Yields:
+        Tuples of (offset, hash_value) in order of offset, skipping every word
+        that contains a base other than A, C, G, T or U.
+    """
+    mask = (1 << (2 * wordsize)) - 1
+    hash_val = 0
+    valid = 0  # Number of unambiguous bases ending at the current position
+
+    # Non-ASCII characters become "?", which is ambiguous like any other symbol
+    codes = sequence.encode("ascii", "replace").translate(_hash_codes)
+    for offset, code in enumerate(codes, 1 - wordsize):
+        if code > 3:
+            valid = 0
+            continue
+
+        hash_val = ((hash_val << 2) | code) & mask
+        valid += 1
+        if valid >= wordsize:
+            yield offset, hash_val
+
+
+def find_words(sequence: str, hashes: Collection[int], wordsize: int) -> List[Tuple[int, int]]:
+    """
+    Locate every occurrence of the given hash words in a sequence.
+
+    Gives the same result as keeping the words from ``hash_words`` whose hash
+    is in ``hashes``, but searches for each word with ``str.find`` instead of
+    visiting every position. This is much faster when there are few words.
+
+    Args:
+        sequence: The sequence to scan
+        hashes: Hash values of the words to look for
         wordsize: Word size for hashing
 
     Returns:
-        Tuple of (offset, hash_value). If no valid hash can be computed,
-        offset will be -1.
+        List of (offset, hash_value) tuples sorted by offset
     """
-    primer = primer.upper()
-    primer_len = len(primer)
-    if primer_len < wordsize:
-        return -1, 0
+    if not sequence.isascii():
+        # Case folding could change the length of non-ASCII text
+        return [(offset, h) for offset, h in hash_words(sequence, wordsize) if h in hashes]
+
+    # Hashing ignores case and reads U as T, so normalise the text the same way
+    text = sequence.upper()
+    if "U" in text:
+        text = text.replace("U", "T")
 
-    # Try all possible positions for the hash word
-    for offset in range(primer_len - wordsize + 1):
-        hash_val = 0
-        valid_hash = True
+    found = []
+    find = text.find
+    shifts = range(2 * (wordsize - 1), -1, -2)
+    for h in hashes:
+        word = "".join("ACGT"[(h >> shift) & 3] for shift in shifts)
+        offset = find(word)
+        while offset >= 0:
+            found.append((offset, h))
+            offset = find(word, offset + 1)
 
-        for i in range(wordsize):
-            base = primer[offset + i]
-            code = _scode[ord(base)]
-            if code == AMBIG:
-                valid_hash = False
-                break
+    found.sort()
+    return found
 
-            hash_val = (hash_val << 2) | code
 
-        if valid_hash:
-            return offset, hash_val
+def hash_value(primer: str, wordsize: int) -> Tuple[int, int]:
+    """
+    Compute a hash value for the specified primer.
+
+    Args:
+        primer: The primer sequence
+        wordsize: Word size for hashing
 
-    return -1, 0
+    Returns:
+        Tuple of (offset, hash_value) for the first unambiguous word. If no
+        valid hash can be computed, offset will be -1.
+    """
+    # Non-ASCII characters become "?", which is ambiguous like any other symbol
+    digits = primer.encode("ascii", "replace").translate(_hash_digits)
+    match = re.search(b"[0-3]{%d}" % wordsize, digits)
+    if match is None:
+        return -1, 0
+    return match.start(), int(match.group(), 4)
 
 
 def init_iupac_tables(iupac_mode: bool = False) -> Dict:
@@ -3,14 +3,20 @@ FASTA file loading functionality.
 """
 
 import logging
-import os
 import time
-from typing import List
+from itertools import chain
+from typing import List, TextIO
 
 from ..core.models import FASTARecord
 
 logger = logging.getLogger(__name__)
 
+# Valid nucleotide characters, including IUPAC ambiguity codes
+_NUCLEOTIDES = "ACGTBDHKMNRSVWXY"
+
+# str.translate deletion table dropping every ASCII non-nucleotide character
+_DROP_NON_NUCLEOTIDES = {i: None for i in range(128) if chr(i).upper() not in _NUCLEOTIDES}
+
 
 class FASTALoader:
     """Class for loading FASTA files."""
@@ -23,42 +29,59 @@ class FASTALoader:
         Args:
             filename: Path to the FASTA file
 
+        Returns:
+            List of FASTARecord objects
+        """
+        with open(filename, "r") as file:
+            return FASTALoader.load_stream(file)
+
+    @staticmethod
+    def load_stream(file: TextIO) -> List[FASTARecord]:
+        """
+        Load sequences from an open text stream.
+
+        Args:
+            file: Stream of FASTA lines, e.g. an open file or StringIO
+
         Returns:
             List of FASTARecord objects
         """
         start_time = time.time()
-        file_size = os.path.getsize(filename)
+        name = getattr(file, "name", "<stream>")
 
-        if file_size == 0:
-            logger.error(f"FASTA file '{filename}' is empty")
+        first_line = file.readline()
+        if not first_line:
+            logger.error(f"FASTA file '{name}' is empty")
             return []
 
-        logger.info(f"Reading FASTA file: {filename}")
+        logger.info(f"Reading FASTA file: {name}")
 
         fasta_records = []
         current_defline = None
         current_sequence = []
 
-        with open(filename, "r") as file:
-            for line in file:
-                line = line.strip()
-
-                if not line:
-                    continue
-
-                if line.startswith(">"):
-                    # If we were already working on a sequence, save it
-                    if current_defline is not None:
-                        seq = "".join(current_sequence)
-                        fasta_records.append(FASTARecord(defline=current_defline, sequence=seq))
-
-                    # Start a new sequence
-                    current_defline = line
-                    current_sequence = []
+        for line in chain((first_line,), file):
+            line = line.strip()
+
+            if not line:
+                continue
+
+            if line.startswith(">"):
+                # If we were already working on a sequence, save it
+                if current_defline is not None:
+                    seq = "".join(current_sequence)
+                    fasta_records.append(FASTARecord(defline=current_defline, sequence=seq))
+
+                # Start a new sequence
+                current_defline = line
+                current_sequence = []
+            else:
+                # Add to current sequence, keeping only valid nucleotide characters
+                if line.isascii():
+                    filtered_line = line.translate(_DROP_NON_NUCLEOTIDES)
                 else:
-                    # Add to current sequence, keeping only valid nucleotide characters
-                    filtered_line = "".join(c for c in line if c.upper() in "ACGTBDHKMNRSVWXY")
-                    current_sequence.append(filtered_line)
+                    filtered_line = "".join(c for c in line if c.upper() in _NUCLEOTIDES)
+                current_sequence.append(filtered_line)
 
         # Don't forget the last sequence
         if current_defline is not None:
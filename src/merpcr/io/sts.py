@@ -2,26 +2,47 @@
 STS file loading functionality.
 """
 
+import concurrent.futures
 import logging
 import os
+import re
 import time
-from typing import Dict, List
+from collections import Counter, deque
+from dataclasses import fields as dataclass_fields
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 from ..core.models import STSRecord
+from ..core.utils import encode_sequence, hash_value, reverse_complement
 
 logger = logging.getLogger(__name__)
 
+# Constants
+MIN_FILESIZE_FOR_THREADING = 1000000
+PARALLEL_BATCH_SIZE = 10000  # Valid STS lines handed to a worker at a time
+
+# PCR size field: a single size or a "low-high" range of ASCII digits
+_PCR_SIZE_PATTERN = re.compile(r"\s*([0-9]+)\s*(?:-\s*([0-9]+)\s*)?")
+
+# Worker results are sent back as plain field tuples, which pickle several
+# times faster than the dataclasses themselves
+_record_fields = attrgetter(*(f.name for f in dataclass_fields(STSRecord)))
+
 
 class STSLoader:
     """Class for loading STS files."""
 
-    def __init__(self, wordsize: int, margin: int, default_pcr_size: int):
+    def __init__(self, wordsize: int, margin: int, default_pcr_size: int, threads: int = 1):
         """Initialize STS loader with parameters."""
         self.wordsize = wordsize
         self.margin = margin
         self.default_pcr_size = default_pcr_size
+        self.threads = threads
 
-    def load_file(self, filename: str) -> tuple[List[STSRecord], Dict[int, List[STSRecord]], int]:
+    def load_file(
+        self, filename: str
+    ) -> Optional[Tuple[List[STSRecord], Dict[int, Tuple[STSRecord, ...]], int]]:
         """
         Load STS records from a tab-delimited file.
 
@@ -29,90 +50,88 @@ class STSLoader:
             filename: Path to the STS file
 
         Returns:
-            Tuple of (sts_records, sts_table, max_pcr_size)
+            Tuple of (sts_records, sts_table, max_pcr_size), or None if the
+            file is empty or malformed
         """
-        start_time = time.time()
         file_size = os.path.getsize(filename)
+        with open(filename, "r") as file:
+            return self.load_stream(file, file_size)
+
+    def load_stream(
+        self, file: TextIO, size_hint: int = 0
+    ) -> Optional[Tuple[List[STSRecord], Dict[int, Tuple[STSRecord, ...]], int]]:
+        """
+        Load STS records from an open text stream.
+
+        Args:
+            file: Stream of tab-delimited STS lines, e.g. an open file or StringIO
+            size_hint: Size of the input in bytes, used to decide whether loading
+                is worth spreading over several processes
+
+        Returns:
+            Tuple of (sts_records, sts_table, max_pcr_size), or None if the
+            input is empty or malformed
+        """
+        start_time = time.time()
+        name = getattr(file, "name", "<stream>")
 
-        if file_size == 0:
-            logger.error(f"STS file '{filename}' is empty")
-            return [], {}, 0
+        first_line = file.readline()
+        if not first_line:
+            logger.error(f"STS file '{name}' is empty")
+            return None
 
-        logger.info(f"Reading STS file: {filename}")
+        logger.info(f"Reading STS file: {name}")
 
         sts_records = []
         sts_table = {}
         max_pcr_size = 0
 
-        bad_primers_short = 0
-        bad_primers_ambig = 0
-        bad_pcr_size = 0
+        stats = Counter()
 
-        with open(filename, "r") as file:
-            lines = file.readlines()
-            line_no = 0
-
-            for line in lines:
-                line_no += 1
-                line = line.strip()
-
-                # Skip comments and blank lines
-                if not line or line.startswith("#"):
-                    continue
-
-                # Parse tab-delimited fields
-                fields = line.split("\t")
-                if len(fields) < 4:
-                    logger.error(
-                        f"Bad STS file format at line {line_no}. Expected at least 4 fields."
-                    )
-                    return [], {}, 0
-
-                sts_id = fields[0]
-                primer1 = fields[1].upper()
-                primer2 = fields[2].upper()
-
-                # Parse PCR size
-                pcr_size = self._parse_pcr_size(fields[3])
-                alias = fields[4] if len(fields) > 4 else ""
-
-                # Check if primer length and PCR size are valid
-                if len(primer1) < self.wordsize or len(primer2) < self.wordsize:
-                    bad_primers_short += 1
-                    continue
-
-                if len(primer1) + len(primer2) > pcr_size:
-                    bad_pcr_size += 1
-                    pcr_size = len(primer1) + len(primer2)
-
-                # Keep track of the maximum PCR size
-                if pcr_size > max_pcr_size:
-                    max_pcr_size = pcr_size
-
-                # Create STS records for both directions
-                self._create_sts_records(
-                    sts_records,
-                    sts_table,
-                    sts_id,
-                    primer1,
-                    primer2,
-                    pcr_size,
-                    alias,
-                    line_no,
-                    bad_primers_ambig,
-                )
+        # Bind the container methods once; they are called for every record
+        records_append = sts_records.append
+        table_setdefault = sts_table.setdefault
+
+        # Stream the file through parse -> validate -> insert stages so no
+        # stage holds more than the current line. Text-mode line iteration is
+        # done in C and is faster here than raw os.read() chunks split by hand.
+        lines = chain((first_line,), file)
+        valid = self._iter_valid(self._iter_raw_records(lines), stats)
+        if self.threads > 1 and size_hint >= MIN_FILESIZE_FOR_THREADING:
+            created_records = self._iter_created_parallel(valid, stats)
+        else:
+            created_records = self._iter_created(valid, stats)
+
+        for pcr_size, created in created_records:
+            # Keep track of the maximum PCR size
+            if pcr_size > max_pcr_size:
+                max_pcr_size = pcr_size
+
+            for hash_val, sts in created:
+                table_setdefault(hash_val, []).append(sts)
+                records_append(sts)
+
+        if stats["bad_format"]:
+            return None
+
+        # The table is read-only from here on: store each bucket as a tuple,
+        # which drops the list over-allocation and is cheaper to iterate
+        sts_table = {hash_val: tuple(bucket) for hash_val, bucket in sts_table.items()}
 
         # Report statistics
+        bad_primers_short = stats["short_primers"]
         if bad_primers_short > 0:
             logger.warning(
                 f"{bad_primers_short} STSs have primer shorter than word size ({self.wordsize}): not included in search"
             )
 
+        bad_primers_ambig = stats["ambiguous_primers"]
         if bad_primers_ambig > 0:
             logger.warning(
                 f"{bad_primers_ambig} primers have ambiguities which prevent computation of a hash value: not included in search"
             )
 
+        bad_pcr_size = stats["pcr_size_adjusted"]
         if bad_pcr_size > 0:
             logger.warning(
                 f"{bad_pcr_size} STSs have a primer length sum greater than the pcr size: expected pcr size adjusted"
@@ -123,80 +142,205 @@ class STSLoader:
         )
         return sts_records, sts_table, max_pcr_size
 
+    @staticmethod
+    def _iter_raw_records(lines: Iterable[str]) -> Iterator[Tuple[int, List[str]]]:
+        """Yield (line_no, fields) for every line that is not blank or a comment."""
+        for line_no, line in enumerate(lines, 1):
+            line = line.strip()
+
+            # Skip comments and blank lines
+            if not line or line.startswith("#"):
+                continue
+
+            yield line_no, line.split("\t")
+
+    def _iter_valid(
+        self, raw_records: Iterable[Tuple[int, List[str]]], stats: Counter
+    ) -> Iterator[Tuple[str, str, str, int, str, int]]:
+        """
+        Parse raw records, yielding those usable for searching.
+
+        Yields (sts_id, primer1, primer2, pcr_size, alias, line_no). Skipped and
+        adjusted records are counted in ``stats``; a record with too few fields
+        is logged, counted as ``bad_format`` and stops the iteration.
+        """
+        for line_no, fields in raw_records:
+            if len(fields) < 4:
+                logger.error(f"Bad STS file format at line {line_no}. Expected at least 4 fields.")
+                stats["bad_format"] += 1
+                return
+
+            primer1 = fields[1].upper()
+            primer2 = fields[2].upper()
+
+            # Parse PCR size
+            pcr_size = self._parse_pcr_size(fields[3])
+            alias = fields[4] if len(fields) > 4 else ""
+
+            # Check if primer length and PCR size are valid
+            if len(primer1) < self.wordsize or len(primer2) < self.wordsize:
+                stats["short_primers"] += 1
+                continue
+
+            if len(primer1) + len(primer2) > pcr_size:
+                stats["pcr_size_adjusted"] += 1
+                pcr_size = len(primer1) + len(primer2)
+
+            yield fields[0], primer1, primer2, pcr_size, alias, line_no
+
+    def _iter_created(
+        self, valid_records: Iterable[Tuple[str, str, str, int, str, int]], stats: Counter
+    ) -> Iterator[Tuple[int, Tuple[Tuple[int, STSRecord], ...]]]:
+        """Yield (pcr_size, (hash_value, record) pairs) for each valid STS."""
+        create_sts_records = self._create_sts_records
+        for record in valid_records:
+            yield record[3], create_sts_records(*record, stats)
+
+    def _iter_created_parallel(
+        self, valid_records: Iterable[Tuple[str, str, str, int, str, int]], stats: Counter
+    ) -> Iterator[Tuple[int, Tuple[Tuple[int, STSRecord], ...]]]:
+        """
+        Yield the same results as ``_iter_created`` using a process pool.
+
+        Validation stays in this process so errors are logged in order; the
+        hashing, packing and reverse complementing is done by the workers in
+        batches of ``PARALLEL_BATCH_SIZE`` lines. At most two batches per
+        worker are in flight, so the input is read only as fast as results
+        are consumed.
+        """
+        valid_records = iter(valid_records)
+        batches = iter(lambda: list(islice(valid_records, PARALLEL_BATCH_SIZE)), [])
+        max_pending = 2 * self.threads
+
+        logger.info(f"Loading STS records using {self.threads} processes")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.threads) as executor:
+            pending = deque()
+            for batch in batches:
+                pending.append(executor.submit(self._create_batch, batch))
+                if len(pending) >= max_pending:
+                    yield from self._unpack_batch(pending.popleft().result(), stats)
+            while pending:
+                yield from self._unpack_batch(pending.popleft().result(), stats)
+
+    @staticmethod
+    def _unpack_batch(
+        result: Tuple[List[Tuple[int, Tuple[Tuple[int, tuple], ...]]], Counter], stats: Counter
+    ) -> Iterator[Tuple[int, Tuple[Tuple[int, STSRecord], ...]]]:
+        """Rebuild the records of a ``_create_batch`` result and merge its stats."""
+        created_batch, batch_stats = result
+        stats.update(batch_stats)
+        for pcr_size, created in created_batch:
+            yield pcr_size, tuple(
+                (hash_val, STSRecord(*record_fields)) for hash_val, record_fields in created
+            )
+
+    def _create_batch(
+        self, valid_records: List[Tuple[str, str, str, int, str, int]]
+    ) -> Tuple[List[Tuple[int, Tuple[Tuple[int, tuple], ...]]], Counter]:
+        """Create the records for a batch of valid STSs as picklable field tuples."""
+        stats = Counter()
+        batch = [
+            (pcr_size, tuple((hash_val, _record_fields(sts)) for hash_val, sts in created))
+            for pcr_size, created in self._iter_created(valid_records, stats)
+        ]
+        return batch, stats
+
     def _parse_pcr_size(self, pcr_size_str: str) -> int:
-        """Parse PCR size from string, handling ranges."""
-        if "-" in pcr_size_str:
-            try:
-                size_range = pcr_size_str.split("-")
-                if len(size_range) == 2 and size_range[0] and size_range[1]:
-                    low = int(size_range[0])
-                    high = int(size_range[1])
-                    return (low + high) // 2
-                else:
-                    return self.default_pcr_size
-            except ValueError:
-                return self.default_pcr_size
+        """
+        Parse PCR size from string, handling ranges.
+
+        Sizes are plain ASCII digits, optionally padded with whitespace. Signs,
+        underscores and non-ASCII digits, which ``int()`` would accept, fall
+        back to the default size like any other malformed field.
+        """
+        if pcr_size_str.isascii() and pcr_size_str.isdigit():
+            pcr_size = int(pcr_size_str)
         else:
-            try:
-                pcr_size = int(pcr_size_str)
-                return pcr_size if pcr_size > 0 else self.default_pcr_size
-            except ValueError:
+            match = _PCR_SIZE_PATTERN.fullmatch(pcr_size_str)
+            if match is None:
                 return self.default_pcr_size
 
+            low, high = match.groups()
+            pcr_size = (int(low) + int(high)) // 2 if high else int(low)
+
+        return pcr_size if pcr_size > 0 else self.default_pcr_size
+
     def _create_sts_records(
         self,
-        sts_records: List[STSRecord],
-        sts_table: Dict[int, List[STSRecord]],
         sts_id: str,
         primer1: str,
         primer2: str,
         pcr_size: int,
         alias: str,
         line_no: int,
-        bad_primers_ambig: int,
-    ):
-        """Create STS records for both forward and reverse directions."""
-        from ..core.utils import hash_value, reverse_complement
-
-        # Create base STS record
-        sts = STSRecord(
-            id=sts_id,
-            primer1=primer1,
-            primer2=primer2,
-            pcr_size=pcr_size,
-            alias=alias,
-            offset=line_no,
-            direct="+",
-        )
+        stats: Counter,
+    ) -> Tuple[Tuple[int, STSRecord], ...]:
+        """
+        Create STS records for both forward and reverse directions.
 
-        # Forward primer hash
-        hash_offset1, hash_value1 = hash_value(primer1, self.wordsize)
+        Returns (hash_value, record) pairs to be inserted into the hash table.
+        Primers without a hashable word are counted in ``stats["ambiguous_primers"]``.
+        """
+        wordsize = self.wordsize
+        created = ()
+
+        # Pack primers into 2-bit codes once so the search can compare them
+        # with integer operations instead of walking the strings
+        code1 = encode_sequence(primer1)
+        code2 = encode_sequence(primer2)
+
+        # A fully packed primer hashes on its first word, which is just the top
+        # bits of its code; only primers with other characters need the scan
+        if code1 >= 0:
+            hash_offset1, hash_value1 = 0, code1 >> 2 * (len(primer1) - wordsize)
+        else:
+            hash_offset1, hash_value1 = hash_value(primer1, wordsize)
         if hash_offset1 >= 0:
-            sts_for = STSRecord(**{**vars(sts), "hash_offset": hash_offset1, "direct": "+"})
-            self._insert_sts(sts_records, sts_table, sts_for, hash_value1)
+            sts_for = STSRecord(
+                id=sts_id,
+                primer1=primer1,
+                primer2=primer2,
+                pcr_size=pcr_size,
+                alias=alias,
+                offset=line_no,
+                hash_offset=hash_offset1,
+                direct="+",
+                ambig_primer=self._ambig_flags(code1, code2),
+                primer1_code=code1,
+                primer2_code=code2,
+            )
+            created = ((hash_value1, sts_for),)
         else:
-            bad_primers_ambig += 1
+            stats["ambiguous_primers"] += 1
 
         # Reverse direction: search for primer2 (forward) followed by primer1_rc
         rev_primer1 = reverse_complement(primer1)
-        hash_offset2, hash_value2 = hash_value(primer2, self.wordsize)
+        rev_code1 = encode_sequence(rev_primer1)
+        if code2 >= 0:
+            hash_offset2, hash_value2 = 0, code2 >> 2 * (len(primer2) - wordsize)
+        else:
+            hash_offset2, hash_value2 = hash_value(primer2, wordsize)
         if hash_offset2 >= 0:
-            sts_rev = STSRecord(**{**vars(sts), "hash_offset": hash_offset2, "direct": "-"})
-            sts_rev.primer1 = primer2
-            sts_rev.primer2 = rev_primer1
-            self._insert_sts(sts_records, sts_table, sts_rev, hash_value2)
+            sts_rev = STSRecord(
+                id=sts_id,
+                primer1=primer2,
+                primer2=rev_primer1,
+                pcr_size=pcr_size,
+                alias=alias,
+                offset=line_no,
+                hash_offset=hash_offset2,
+                direct="-",
+                ambig_primer=self._ambig_flags(code2, rev_code1),
+                primer1_code=code2,
+                primer2_code=rev_code1,
+            )
+            created += ((hash_value2, sts_rev),)
         else:
-            bad_primers_ambig += 1
+            stats["ambiguous_primers"] += 1
 
-    def _insert_sts(
-        self,
-        sts_records: List[STSRecord],
-        sts_table: Dict[int, List[STSRecord]],
-        sts: STSRecord,
-        hash_value: int,
-    ):
-        """Insert an STS record into the hash table."""
-        if hash_value not in sts_table:
-            sts_table[hash_value] = []
-        sts_table[hash_value].append(sts)
-        sts_records.append(sts)
+        return created
+
+    @staticmethod
+    def _ambig_flags(code1: int, code2: int) -> int:
+        """Return ambiguity flags (1 = primer1, 2 = primer2) for packed primer codes."""
+        return (1 if code1 < 0 else 0) | (2 if code2 < 0 else 0)
@@ -0,0 +1,76 @@
+"""
+Shared pytest fixtures for merPCR tests.
+"""
+
+import copy
+import os
+from pathlib import Path
+
+import pytest
+
+from merpcr import MerPCR
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# Property tests load this hypothesis profile on pytest-xdist workers
+if os.getenv("PYTEST_XDIST_WORKER"):
+    os.environ.setdefault("HYPOTHESIS_PROFILE", "xdist")
+
+
+@pytest.fixture(scope="session")
+def inner_threads():
+    """Engine thread count that keeps parallel pytest-xdist workers from oversubscribing cores."""
+    workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return max(1, min(8, (os.cpu_count() or 1) // workers))
+
+
+@pytest.fixture(scope="session")
+def real_sts_file():
+    """Path to the real STS file from me-PCR."""
+    sts_file = DATA_DIR / "test.sts"
+    if not sts_file.exists():
+        pytest.skip("test.sts file not found")
+    return sts_file
+
+
+@pytest.fixture(scope="session")
+def real_fasta_file():
+    """Path to the real FASTA file from me-PCR."""
+    fasta_file = DATA_DIR / "test.fa"
+    if not fasta_file.exists():
+        pytest.skip("test.fa file not found")
+    return fasta_file
+
+
+@pytest.fixture(scope="session")
+def loaded_engine(real_sts_file):
+    """A default MerPCR with the real STS file loaded once per session.
+
+    Shared between tests: do not modify it, use ``engine_factory`` instead.
+    """
+    mer_pcr = MerPCR()
+    assert mer_pcr.load_sts_file(str(real_sts_file))
+    return mer_pcr
+
+
+@pytest.fixture(scope="session")
+def fasta_records(loaded_engine, real_fasta_file):
+    """The real FASTA records, parsed once per session."""
+    return loaded_engine.load_fasta_file(str(real_fasta_file))
+
+
+@pytest.fixture
+def engine_factory(loaded_engine):
+    """Return copies of ``loaded_engine`` with search parameters such as margin overridden.
+
+    The copies share the loaded STS records and hash table, which are not
+    modified by searching, so no file is parsed again.
+    """
+
+    def make_engine(**overrides):
+        mer_pcr = copy.copy(loaded_engine)
+        for name, value in overrides.items():
+            setattr(mer_pcr, name, value)
+        return mer_pcr
+
+    return make_engine
@@ -4,6 +4,7 @@ Tests for command-line interface.
 """
 
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
@@ -30,6 +31,10 @@ class TestCLI(unittest.TestCase):
         if not self.sts_file.exists():
             self.skipTest("Test data files not available")
 
+        # Per-test scratch directory for output files, removed in one go
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="merpcr-cli-"))
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+
     def test_basic_cli_execution(self):
         """Test basic CLI execution."""
         result = subprocess.run(
@@ -57,34 +62,27 @@ class TestCLI(unittest.TestCase):
 
     def test_output_file(self):
         """Test output to file."""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
-            output_file = f.name
-
-        try:
-            result = subprocess.run(
-                [
-                    str(self.script_path),
-                    "-O",
-                    output_file,
-                    str(self.sts_file),
-                    str(self.fasta_file),
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            self.assertEqual(result.returncode, 0)
-
-            # Check output file was created and contains expected content
-            with open(output_file, "r") as f:
-                content = f.read()
-
-            self.assertIn("L78833", content)
-            self.assertIn("AFM248yg9", content)
-
-        finally:
-            if os.path.exists(output_file):
-                os.unlink(output_file)
+        output_file = self.tmp_dir / "output.txt"
+
+        result = subprocess.run(
+            [
+                str(self.script_path),
+                "-O",
+                str(output_file),
+                str(self.sts_file),
+                str(self.fasta_file),
+            ],
+            capture_output=True,
+            text=True,
+        )
+
+        self.assertEqual(result.returncode, 0)
+
+        # Check output file was created and contains expected content
+        content = output_file.read_text()
+
+        self.assertIn("L78833", content)
+        self.assertIn("AFM248yg9", content)
 
     def test_parameter_parsing(self):
         """Test parameter parsing."""
@@ -3,9 +3,7 @@ Enhanced CLI tests focusing on argument conversion and validation.
 """
 
 import argparse
-import os
 import sys
-import tempfile
 from unittest.mock import patch
 
 import pytest
@@ -159,33 +157,26 @@ class TestParameterValidation:
 class TestCLIIntegration:
     """Test CLI integration with argument conversion."""
 
-    def test_mepcr_format_integration(self):
+    def test_mepcr_format_integration(self, tmp_path):
         """Test that me-PCR format works end-to-end."""
-        # Create temporary test files
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_file:
-            sts_file.write("TEST\tACGT\tTCGA\t100\ttest marker\n")
-            sts_path = sts_file.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_file:
-            fasta_file.write(">test\nACGTACGTTCGATCGA\n")
-            fasta_path = fasta_file.name
-
-        try:
-            # Test parsing with me-PCR format
-            with patch("sys.argv", ["merpcr", sts_path, fasta_path, "M=100", "N=1"]):
-                parser = create_parser()
-                # Simulate argument conversion
-                converted_args = convert_mepcr_arguments([sts_path, fasta_path, "M=100", "N=1"])
-                args = parser.parse_args(converted_args)
-
-                assert args.sts_file == sts_path
-                assert args.fasta_file == fasta_path
-                assert args.margin == 100
-                assert args.mismatches == 1
-
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        sts_path = tmp_path / "test.sts"
+        sts_path.write_text("TEST\tACGT\tTCGA\t100\ttest marker\n")
+        fasta_path = tmp_path / "test.fa"
+        fasta_path.write_text(">test\nACGTACGTTCGATCGA\n")
+
+        # Test parsing with me-PCR format
+        with patch("sys.argv", ["merpcr", str(sts_path), str(fasta_path), "M=100", "N=1"]):
+            parser = create_parser()
+            # Simulate argument conversion
+            converted_args = convert_mepcr_arguments(
+                [str(sts_path), str(fasta_path), "M=100", "N=1"]
+            )
+            args = parser.parse_args(converted_args)
+
+            assert args.sts_file == str(sts_path)
+            assert args.fasta_file == str(fasta_path)
+            assert args.margin == 100
+            assert args.mismatches == 1
 
     def test_help_format_integration(self):
         """Test that -help works correctly."""
@@ -193,26 +184,18 @@ class TestCLIIntegration:
             converted_args = convert_mepcr_arguments(["-help"])
             assert converted_args == ["--help"]
 
-    def test_stdout_handling(self):
+    def test_stdout_handling(self, tmp_path):
         """Test stdout output handling."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_file:
-            sts_file.write("TEST\tACGT\tTCGA\t100\n")
-            sts_path = sts_file.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_file:
-            fasta_file.write(">test\nACGTTCGA\n")
-            fasta_path = fasta_file.name
+        sts_path = tmp_path / "test.sts"
+        sts_path.write_text("TEST\tACGT\tTCGA\t100\n")
+        fasta_path = tmp_path / "test.fa"
+        fasta_path.write_text(">test\nACGTTCGA\n")
 
-        try:
-            parser = create_parser()
-            # Test O=stdout conversion
-            converted_args = convert_mepcr_arguments([sts_path, fasta_path, "O=stdout"])
-            args = parser.parse_args(converted_args)
-            assert args.output == "stdout"
-
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        parser = create_parser()
+        # Test O=stdout conversion
+        converted_args = convert_mepcr_arguments([str(sts_path), str(fasta_path), "O=stdout"])
+        args = parser.parse_args(converted_args)
+        assert args.output == "stdout"
 
 
 class TestErrorHandling:
@@ -5,129 +5,117 @@ Comprehensive tests for merPCR using actual test data from me-PCR.
 
 import os
 import sys
-import tempfile
-import unittest
-from pathlib import Path
 
 import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from merpcr import FASTARecord, MerPCR, STSRecord
+from merpcr import MerPCR
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """A default MerPCR for tests of its pure sequence helpers."""
+    return MerPCR()
+
+
+@pytest.fixture(scope="module")
+def reverse_complement(engine):
+    """``engine._reverse_complement``, bound once for the parametrized cases."""
+    return engine._reverse_complement
+
+
+@pytest.fixture(scope="module")
+def hash_value(engine):
+    """``engine._hash_value``, bound once for the parametrized cases."""
+    return engine._hash_value
 
 
 @pytest.mark.integration
-class TestMerPCRComprehensive(unittest.TestCase):
-    """Comprehensive tests using real data from me-PCR."""
-
-    def setUp(self):
-        """Set up test data."""
-        self.test_dir = Path(__file__).parent / "data"
-        self.sts_file = self.test_dir / "test.sts"
-        self.fasta_file = self.test_dir / "test.fa"
-
-        # Ensure test files exist
-        if not self.sts_file.exists():
-            self.skipTest("test.sts file not found")
-        if not self.fasta_file.exists():
-            self.skipTest("test.fa file not found")
-
-    def test_load_real_sts_file(self):
+@pytest.mark.xdist_group("real_data")
+class TestMerPCRComprehensive:
+    """Comprehensive tests using real data from me-PCR.
+
+    The STS and FASTA files are parsed once per session by the fixtures in
+    conftest.py and shared between tests.
+    """
+
+    def test_load_real_sts_file(self, real_sts_file):
         """Test loading the real STS file from me-PCR."""
         mer_pcr = MerPCR()
-        success = mer_pcr.load_sts_file(str(self.sts_file))
+        success = mer_pcr.load_sts_file(str(real_sts_file))
 
-        self.assertTrue(success)
+        assert success
         # Should have 6 records (3 STSs * 2 directions each)
-        self.assertEqual(len(mer_pcr.sts_records), 6)
+        assert len(mer_pcr.sts_records) == 6
 
         # Check specific STSs
         sts_ids = [sts.id for sts in mer_pcr.sts_records]
-        self.assertIn("AFM256vb9", sts_ids)
-        self.assertIn("AFM248yg9", sts_ids)
-        self.assertIn("AFM186xa1", sts_ids)
+        assert "AFM256vb9" in sts_ids
+        assert "AFM248yg9" in sts_ids
+        assert "AFM186xa1" in sts_ids
 
         # Check that we have both directions
         directions = [sts.direct for sts in mer_pcr.sts_records]
-        self.assertIn("+", directions)
-        self.assertIn("-", directions)
+        assert "+" in directions
+        assert "-" in directions
 
-    def test_load_real_fasta_file(self):
+    def test_load_real_fasta_file(self, fasta_records):
         """Test loading the real FASTA file from me-PCR."""
-        mer_pcr = MerPCR()
-        fasta_records = mer_pcr.load_fasta_file(str(self.fasta_file))
-
-        self.assertEqual(len(fasta_records), 1)
-        self.assertEqual(fasta_records[0].label, "L78833")
+        assert len(fasta_records) == 1
+        assert fasta_records[0].label == "L78833"
         # Check sequence length
-        self.assertGreater(len(fasta_records[0].sequence), 100000)
+        assert len(fasta_records[0].sequence) > 100000
 
-    def test_search_real_data(self):
+    def test_search_real_data(self, engine_factory, fasta_records, tmp_path):
         """Test searching with real data - should match me-PCR output."""
-        mer_pcr = MerPCR()
-
-        # Load data
-        success = mer_pcr.load_sts_file(str(self.sts_file))
-        self.assertTrue(success)
-
-        fasta_records = mer_pcr.load_fasta_file(str(self.fasta_file))
-        self.assertEqual(len(fasta_records), 1)
-
-        # Create temp output file
-        fd, output_file = tempfile.mkstemp(suffix=".txt")
-        os.close(fd)
+        mer_pcr = engine_factory()
+        output_file = tmp_path / "output.txt"
 
-        try:
-            # Run search
-            hit_count = mer_pcr.search(fasta_records, output_file)
+        # Run search
+        hit_count = mer_pcr.search(fasta_records, str(output_file))
 
-            # Should find 1 hit (same as original me-PCR)
-            self.assertEqual(hit_count, 1)
+        # Should find 1 hit (same as original me-PCR)
+        assert hit_count == 1
 
-            # Check output content
-            with open(output_file, "r") as f:
-                output = f.read().strip()
+        # Check output content
+        output = output_file.read_text().strip()
 
-            # Expected: L78833	75823..76023	AFM248yg9	(-)
-            self.assertIn("L78833", output)
-            self.assertIn("AFM248yg9", output)
-            self.assertIn("75823..76023", output)
-            self.assertIn("(-)", output)
-
-        finally:
-            os.unlink(output_file)
+        # Expected: L78833	75823..76023	AFM248yg9	(-)
+        assert "L78833" in output
+        assert "AFM248yg9" in output
+        assert "75823..76023" in output
+        assert "(-)" in output
 
     def test_parameters_match_original(self):
         """Test that default parameters match original me-PCR."""
         mer_pcr = MerPCR()
 
         # Check default values match C++ version
-        self.assertEqual(mer_pcr.wordsize, 11)  # ePCR_WDSIZE_DEFAULT
-        self.assertEqual(mer_pcr.margin, 50)  # ePCR_MARGIN_DEFAULT
-        self.assertEqual(mer_pcr.mismatches, 0)  # ePCR_MMATCH_DEFAULT
-        self.assertEqual(mer_pcr.three_prime_match, 1)  # ePCR_THREE_PRIME_MATCH_DEFAULT
-        self.assertEqual(mer_pcr.default_pcr_size, 240)  # ePCR_DEFAULT_PCR_SIZE_DEFAULT
+        assert mer_pcr.wordsize == 11  # ePCR_WDSIZE_DEFAULT
+        assert mer_pcr.margin == 50  # ePCR_MARGIN_DEFAULT
+        assert mer_pcr.mismatches == 0  # ePCR_MMATCH_DEFAULT
+        assert mer_pcr.three_prime_match == 1  # ePCR_THREE_PRIME_MATCH_DEFAULT
+        assert mer_pcr.default_pcr_size == 240  # ePCR_DEFAULT_PCR_SIZE_DEFAULT
 
     def test_parameter_validation(self):
-        """Test parameter validation."""
-        # Test valid parameters
+        """Test valid parameters are accepted."""
         mer_pcr = MerPCR(wordsize=12, margin=100, mismatches=2)
-        self.assertEqual(mer_pcr.wordsize, 12)
-
-        # Test invalid wordsize
-        with self.assertRaises(ValueError):
-            MerPCR(wordsize=2)  # Too small
-
-        with self.assertRaises(ValueError):
-            MerPCR(wordsize=17)  # Too large
-
-        # Test invalid mismatches
-        with self.assertRaises(ValueError):
-            MerPCR(mismatches=11)  # Too many
-
-        # Test invalid margin
-        with self.assertRaises(ValueError):
-            MerPCR(margin=20000)  # Too large
+        assert mer_pcr.wordsize == 12
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"wordsize": 2},  # Too small
+            {"wordsize": 17},  # Too large
+            {"mismatches": 11},  # Too many
+            {"margin": 20000},  # Too large
+        ],
+    )
+    def test_invalid_parameters(self, kwargs):
+        """Test out-of-range parameters are rejected."""
+        with pytest.raises(ValueError):
+            MerPCR(**kwargs)
 
     def test_iupac_support(self):
         """Test IUPAC ambiguity support."""
@@ -135,110 +123,84 @@ class TestMerPCRComprehensive(unittest.TestCase):
 
         # Test IUPAC matching
         # N should match any base
-        self.assertTrue(mer_pcr._compare_seqs("ACGT", "NCGT", "+"))
-        self.assertTrue(mer_pcr._compare_seqs("ACGT", "ACNT", "+"))
+        assert mer_pcr._compare_seqs("ACGT", "NCGT", "+")
+        assert mer_pcr._compare_seqs("ACGT", "ACNT", "+")
 
         # R (A or G) should match A and G
-        self.assertTrue(mer_pcr._compare_seqs("ACGT", "RCGT", "+"))
+        assert mer_pcr._compare_seqs("ACGT", "RCGT", "+")
 
         # Without IUPAC mode, should not match
         mer_pcr_no_iupac = MerPCR(iupac_mode=0)
-        self.assertFalse(mer_pcr_no_iupac._compare_seqs("ACGT", "NCGT", "+"))
+        assert not mer_pcr_no_iupac._compare_seqs("ACGT", "NCGT", "+")
 
-    def test_reverse_complement_accuracy(self):
-        """Test reverse complement function accuracy."""
-        mer_pcr = MerPCR()
-
-        test_cases = [
+    @pytest.mark.parametrize(
+        "seq,expected",
+        [
             ("ATGC", "GCAT"),
             ("AAAA", "TTTT"),
             ("CGCG", "CGCG"),
             ("ATCGATCG", "CGATCGAT"),
             ("AGTCAGTC", "GACTGACT"),
-        ]
-
-        for seq, expected in test_cases:
-            result = mer_pcr._reverse_complement(seq)
-            self.assertEqual(result, expected, f"RC of {seq} should be {expected}, got {result}")
-
-    def test_hash_function(self):
-        """Test hash function accuracy."""
-        mer_pcr = MerPCR(wordsize=11)
-
-        # Test valid sequence
-        offset, hash_val = mer_pcr._hash_value("GCTAAAAATACACGGATGG")
-        self.assertGreaterEqual(offset, 0)
-        self.assertGreater(hash_val, 0)
-
-        # Test sequence with ambiguities
-        offset, hash_val = mer_pcr._hash_value("GCTNNNNNNNNGATGG")
-        self.assertEqual(offset, -1)  # No valid hash possible
-
-        # Test short sequence
-        offset, hash_val = mer_pcr._hash_value("ACGT")  # Shorter than wordsize
-        self.assertEqual(offset, -1)
-
-    def test_threading_behavior(self):
+        ],
+    )
+    def test_reverse_complement_accuracy(self, reverse_complement, seq, expected):
+        """Test reverse complement function accuracy."""
+        assert reverse_complement(seq) == expected
+
+    def test_hash_function_valid_sequence(self, hash_value):
+        """Test hash function accuracy on a hashable primer."""
+        offset, hash_val = hash_value("GCTAAAAATACACGGATGG")
+        assert offset >= 0
+        assert hash_val > 0
+
+    @pytest.mark.parametrize(
+        "primer",
+        [
+            "GCTNNNNNNNNGATGG",  # Ambiguities in every word
+            "ACGT",  # Shorter than wordsize
+        ],
+    )
+    def test_hash_function_unhashable(self, hash_value, primer):
+        """Test hash function rejects primers with no valid hash word."""
+        offset, hash_val = hash_value(primer)
+        assert offset == -1  # No valid hash possible
+
+    def test_threading_behavior(self, engine_factory, fasta_records):
         """Test that threading is correctly disabled for small sequences."""
-        mer_pcr = MerPCR(threads=4)
-
-        # Load test data
-        mer_pcr.load_sts_file(str(self.sts_file))
-        fasta_records = mer_pcr.load_fasta_file(str(self.fasta_file))
+        mer_pcr = engine_factory(threads=4)
 
         # Should still work with threading parameter
         hit_count = mer_pcr.search(fasta_records)
-        self.assertEqual(hit_count, 1)
+        assert hit_count == 1
 
-    def test_output_format(self):
+    def test_output_format(self, engine_factory, fasta_records, tmp_path):
         """Test output format matches original me-PCR."""
-        mer_pcr = MerPCR()
-        mer_pcr.load_sts_file(str(self.sts_file))
-        fasta_records = mer_pcr.load_fasta_file(str(self.fasta_file))
-
-        # Create temp output file
-        fd, output_file = tempfile.mkstemp(suffix=".txt")
-        os.close(fd)
+        mer_pcr = engine_factory()
+        output_file = tmp_path / "output.txt"
 
-        try:
-            mer_pcr.search(fasta_records, output_file)
+        mer_pcr.search(fasta_records, str(output_file))
 
-            with open(output_file, "r") as f:
-                lines = f.readlines()
+        lines = output_file.read_text().splitlines()
+        assert len(lines) == 1  # Should have exactly one hit
 
-            self.assertEqual(len(lines), 1)  # Should have exactly one hit
+        line = lines[0].strip()
+        parts = line.split("\t")
 
-            line = lines[0].strip()
-            parts = line.split("\t")
+        # Format: sequence_label    pos1..pos2    sts_id    alias    (orientation)
+        assert len(parts) == 5
+        assert parts[0] == "L78833"  # sequence label
+        assert ".." in parts[1]  # position range
+        assert parts[2] == "AFM248yg9"  # STS ID
+        assert parts[3] == "(D17S932)  Chr.17, 63.7 cM"  # alias
+        assert parts[4] == "(-)"  # orientation
 
-            # Format: sequence_label    pos1..pos2    sts_id    alias    (orientation)
-            self.assertEqual(len(parts), 5)
-            self.assertEqual(parts[0], "L78833")  # sequence label
-            self.assertTrue(".." in parts[1])  # position range
-            self.assertEqual(parts[2], "AFM248yg9")  # STS ID
-            self.assertEqual(parts[3], "(D17S932)  Chr.17, 63.7 cM")  # alias
-            self.assertEqual(parts[4], "(-)")  # orientation
-
-        finally:
-            os.unlink(output_file)
-
-    def test_margin_effect(self):
+    def test_margin_effect(self, engine_factory, fasta_records):
         """Test that margin parameter affects results."""
         # Test with small margin
-        mer_pcr_small = MerPCR(margin=10)
-        mer_pcr_small.load_sts_file(str(self.sts_file))
-        fasta_records = mer_pcr_small.load_fasta_file(str(self.fasta_file))
-        hits_small = mer_pcr_small.search(fasta_records)
+        hits_small = engine_factory(margin=10).search(fasta_records)
 
         # Test with large margin
-        mer_pcr_large = MerPCR(margin=100)
-        mer_pcr_large.load_sts_file(str(self.sts_file))
-        fasta_records = mer_pcr_large.load_fasta_file(str(self.fasta_file))
-        hits_large = mer_pcr_large.search(fasta_records)
+        hits_large = engine_factory(margin=100).search(fasta_records)
 
         # Large margin should find at least as many hits as small margin
-        self.assertGreaterEqual(hits_large, hits_small)
-
-
-if __name__ == "__main__":
-    unittest.main()
+        assert hits_large >= hits_small
@@ -2,17 +2,30 @@
 Comprehensive tests for core engine functionality with focus on search algorithms.
 """
 
-import os
+import copy
 import sys
-import tempfile
 from io import StringIO
-from unittest.mock import mock_open, patch
 
 import pytest
 
 from merpcr.core.engine import MerPCR
 from merpcr.core.models import FASTARecord, STSHit, STSRecord
 
+TINY_STS = "TEST\tATCG\tCGAT\t20\tTest STS\n"
+TINY_FASTA = ">test\nATCGACGTATCGCGAT\n"  # Contains both primers
+
+
+@pytest.fixture(scope="module")
+def tiny_loaded_engine():
+    """A wordsize-4 engine with TINY_STS loaded, and the TINY_FASTA records.
+
+    Shared by the module: tests needing other parameters use a copy.copy().
+    """
+    engine = MerPCR(wordsize=4)
+    engine.load_sts_file(StringIO(TINY_STS))
+    records = engine.load_fasta_file(StringIO(TINY_FASTA))
+    return engine, records
+
 
 class TestMerPCRInitialization:
     """Test MerPCR class initialization and parameter validation."""
@@ -68,19 +81,11 @@ class TestSTSFileLoading:
 AFM248yg9	GCTAAAAATACACGGATGG	TGCAAGACTGCGTCTC	193	(D17S932) Chr.17, 63.7 cM
 AFM256vb9	TCTGAATGGCCCTTGG	TCCTATCTGAGGTGGGGT	180	(D17S934) Chr.17, 63.7 cM
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(sts_content)
-            sts_path = f.name
-
-        try:
-            engine = MerPCR()
-            success = engine.load_sts_file(sts_path)
-            assert success
-            assert len(engine.sts_records) > 0
-            assert engine.max_pcr_size > 0
-
-        finally:
-            os.unlink(sts_path)
+        engine = MerPCR()
+        success = engine.load_sts_file(StringIO(sts_content))
+        assert success
+        assert len(engine.sts_records) > 0
+        assert engine.max_pcr_size > 0
 
     def test_load_nonexistent_sts_file(self):
         """Test loading a nonexistent STS file."""
@@ -93,51 +98,37 @@ AFM256vb9	TCTGAATGGCCCTTGG	TCCTATCTGAGGTGGGGT	180	(D17S934) Chr.17, 63.7 cM
             # This is also acceptable behavior
             pass
 
-    def test_load_empty_sts_file(self):
+    def test_load_empty_sts_file(self, tmp_path):
         """Test loading an empty STS file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            sts_path = f.name
+        sts_path = tmp_path / "empty.sts"
+        sts_path.touch()
 
-        try:
-            engine = MerPCR()
-            success = engine.load_sts_file(sts_path)
-            assert not success
+        engine = MerPCR()
+        success = engine.load_sts_file(sts_path)
+        assert not success
 
-        finally:
-            os.unlink(sts_path)
+    def test_load_empty_sts_stream(self):
+        """Test loading an empty in-memory STS stream."""
+        engine = MerPCR()
+        success = engine.load_sts_file(StringIO(""))
+        assert not success
 
     def test_sts_file_with_invalid_format(self):
         """Test STS file with invalid format."""
         sts_content = "INVALID_LINE_FORMAT\n"
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(sts_content)
-            sts_path = f.name
-
-        try:
-            engine = MerPCR()
-            success = engine.load_sts_file(sts_path)
-            assert not success
-
-        finally:
-            os.unlink(sts_path)
+        engine = MerPCR()
+        success = engine.load_sts_file(StringIO(sts_content))
+        assert not success
 
     def test_sts_file_with_short_primers(self):
         """Test STS file with primers shorter than wordsize."""
         sts_content = "SHORT\tAT\tGC\t100\tShort primers\n"
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(sts_content)
-            sts_path = f.name
-
-        try:
-            engine = MerPCR(wordsize=11)
-            success = engine.load_sts_file(sts_path)
-            # Should succeed but skip short primers
-            assert success
-
-        finally:
-            os.unlink(sts_path)
+        engine = MerPCR(wordsize=11)
+        success = engine.load_sts_file(StringIO(sts_content))
+        # Should succeed but skip short primers
+        assert success
 
 
 class TestFASTAFileLoading:
@@ -149,19 +140,11 @@ class TestFASTAFileLoading:
 ATCGATCGATCGATCGATCGATCG
 ATCGATCGATCGATCGATCGATCG
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as f:
-            f.write(fasta_content)
-            fasta_path = f.name
-
-        try:
-            engine = MerPCR()
-            records = engine.load_fasta_file(fasta_path)
-            assert len(records) == 1
-            assert records[0].label == "test_sequence"
-            assert len(records[0].sequence) > 0
-
-        finally:
-            os.unlink(fasta_path)
+        engine = MerPCR()
+        records = engine.load_fasta_file(StringIO(fasta_content))
+        assert len(records) == 1
+        assert records[0].label == "test_sequence"
+        assert len(records[0].sequence) > 0
 
     def test_load_nonexistent_fasta_file(self):
         """Test loading a nonexistent FASTA file."""
@@ -181,231 +164,169 @@ ATCGATCGATCG
 >seq2
 GCTAGCTAGCTA
 """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as f:
-            f.write(fasta_content)
-            fasta_path = f.name
+        engine = MerPCR()
+        records = engine.load_fasta_file(StringIO(fasta_content))
+        assert len(records) == 2
+        assert records[0].label == "seq1"
+        assert records[1].label == "seq2"
 
-        try:
-            engine = MerPCR()
-            records = engine.load_fasta_file(fasta_path)
-            assert len(records) == 2
-            assert records[0].label == "seq1"
-            assert records[1].label == "seq2"
 
-        finally:
-            os.unlink(fasta_path)
+@pytest.fixture(scope="module")
+def exact_engine():
+    """Engine allowing no mismatches."""
+    return MerPCR(mismatches=0)
+
+
+@pytest.fixture(scope="module")
+def one_mm_engine():
+    """Engine allowing one mismatch anywhere (3' protection disabled)."""
+    return MerPCR(mismatches=1, three_prime_match=0)
+
+
+@pytest.fixture(scope="module")
+def three_prime_engine():
+    """Engine allowing one mismatch outside the protected 3' base."""
+    return MerPCR(mismatches=1, three_prime_match=1)
+
+
+@pytest.fixture(scope="module")
+def iupac_engine():
+    """Engine matching IUPAC ambiguity codes exactly."""
+    return MerPCR(mismatches=0, iupac_mode=1)
 
 
 class TestSequenceComparison:
     """Test sequence comparison functionality."""
 
-    def test_compare_seqs_exact_match(self):
+    @pytest.mark.parametrize(
+        "seq1,seq2,expected",
+        [
+            ("ATCG", "ATCG", True),
+            ("ATCG", "ATCC", False),
+            # Different lengths never match
+            ("ATCG", "ATCGG", False),
+            ("ATCGG", "ATCG", False),
+            # Comparison is case-insensitive
+            ("ATCG", "atcg", True),
+            ("AtCg", "aTcG", True),
+        ],
+    )
+    def test_compare_seqs_exact_match(self, exact_engine, seq1, seq2, expected):
         """Test exact sequence matching."""
-        engine = MerPCR(mismatches=0)
-        assert engine._compare_seqs("ATCG", "ATCG", "+")
-        assert not engine._compare_seqs("ATCG", "ATCC", "+")
-
-    def test_compare_seqs_with_mismatches(self):
+        assert exact_engine._compare_seqs(seq1, seq2, "+") == expected
+
+    @pytest.mark.parametrize(
+        "seq1,seq2,expected",
+        [
+            ("ATCG", "ATCG", True),  # Exact match
+            ("ATCG", "ATCC", True),  # 1 mismatch
+            ("ATCG", "ATAT", False),  # 2 mismatches
+        ],
+    )
+    def test_compare_seqs_with_mismatches(self, one_mm_engine, seq1, seq2, expected):
         """Test sequence matching with allowed mismatches."""
-        engine = MerPCR(mismatches=1, three_prime_match=0)  # Disable 3' protection for this test
-        assert engine._compare_seqs("ATCG", "ATCG", "+")  # Exact match
-        assert engine._compare_seqs("ATCG", "ATCC", "+")  # 1 mismatch
-        assert not engine._compare_seqs("ATCG", "ATAT", "+")  # 2 mismatches
-
-    def test_compare_seqs_three_prime_protection(self):
+        assert one_mm_engine._compare_seqs(seq1, seq2, "+") == expected
+
+    @pytest.mark.parametrize(
+        "seq1,seq2,strand,expected",
+        [
+            # For + strand, 3' end is at the end (last 1 base protected)
+            ("ATCGAA", "CTCGAA", "+", True),  # Mismatch at position 0 (not protected)
+            ("ATCGAA", "ATCGAT", "+", False),  # Mismatch at last position (protected)
+            # For - strand, 3' end is at the beginning (first 1 base protected)
+            ("ATCGAA", "ATCGAC", "-", True),  # Mismatch at position 5 (not protected)
+            ("ATCGAA", "CTCGAA", "-", False),  # Mismatch at first position (protected)
+        ],
+    )
+    def test_compare_seqs_three_prime_protection(
+        self, three_prime_engine, seq1, seq2, strand, expected
+    ):
         """Test 3' end protection in sequence comparison."""
-        engine = MerPCR(mismatches=1, three_prime_match=1)
-
-        # Use longer sequences to clearly separate protected and unprotected regions
-        # For + strand, 3' end is at the end (last 1 base protected)
-        assert engine._compare_seqs(
-            "ATCGAA", "CTCGAA", "+"
-        )  # Mismatch at position 0 (not protected)
-        assert not engine._compare_seqs(
-            "ATCGAA", "ATCGAT", "+"
-        )  # Mismatch at last position (protected)
-
-        # For - strand, 3' end is at the beginning (first 1 base protected)
-        assert engine._compare_seqs(
-            "ATCGAA", "ATCGAC", "-"
-        )  # Mismatch at position 5 (not protected)
-        assert not engine._compare_seqs(
-            "ATCGAA", "CTCGAA", "-"
-        )  # Mismatch at first position (protected)
-
-    def test_compare_seqs_different_lengths(self):
-        """Test sequence comparison with different lengths."""
-        engine = MerPCR()
-        assert not engine._compare_seqs("ATCG", "ATCGG", "+")
-        assert not engine._compare_seqs("ATCGG", "ATCG", "+")
-
-    def test_compare_seqs_case_insensitive(self):
-        """Test case-insensitive sequence comparison."""
-        engine = MerPCR(mismatches=0)
-        assert engine._compare_seqs("ATCG", "atcg", "+")
-        assert engine._compare_seqs("AtCg", "aTcG", "+")
-
-    def test_compare_seqs_iupac_mode(self):
+        assert three_prime_engine._compare_seqs(seq1, seq2, strand) == expected
+
+    @pytest.mark.parametrize(
+        "seq1,seq2",
+        [
+            ("ATCG", "RTCG"),  # R matches A
+            ("GTCG", "RTCG"),  # ...or G
+            ("ATCG", "ATYG"),  # Y matches C
+            ("ATTG", "ATYG"),  # ...or T
+        ],
+    )
+    def test_compare_seqs_iupac_mode(self, iupac_engine, seq1, seq2):
         """Test sequence comparison with IUPAC mode enabled."""
-        engine = MerPCR(mismatches=0, iupac_mode=1)
-        # R matches A or G
-        assert engine._compare_seqs("ATCG", "RTCG", "+")
-        assert engine._compare_seqs("GTCG", "RTCG", "+")
-        # Y matches C or T
-        assert engine._compare_seqs("ATCG", "ATYG", "+")
-        assert engine._compare_seqs("ATTG", "ATYG", "+")
+        assert iupac_engine._compare_seqs(seq1, seq2, "+")
 
 
 class TestSearchFunctionality:
     """Test core search functionality."""
 
-    def test_basic_search(self):
+    def test_basic_search(self, tiny_loaded_engine):
         """Test basic search functionality with a simple case."""
-        # Create simple test data
-        sts_content = "TEST\tATCG\tCGAT\t20\tTest STS\n"
-        fasta_content = ">test\nATCGACGTATCGCGAT\n"  # Contains both primers
+        engine, records = tiny_loaded_engine
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
+        hit_count = engine.search(records, output_file=None)
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            engine = MerPCR(wordsize=4, margin=50)
-            engine.load_sts_file(sts_path)
-            records = engine.load_fasta_file(fasta_path)
-
-            # Capture output
-            output_io = StringIO()
-            hit_count = engine.search(records, output_file=None)
-
-            assert hit_count >= 0  # Should complete without error
-
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        assert hit_count >= 0  # Should complete without error
 
     def test_search_with_no_hits(self):
         """Test search when no hits are found."""
         sts_content = "TEST\tAAAA\tTTTT\t20\tTest STS\n"
         fasta_content = ">test\nCCCCGGGGCCCCGGGG\n"  # No matching primers
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
+        engine = MerPCR(wordsize=4)
+        engine.load_sts_file(StringIO(sts_content))
+        records = engine.load_fasta_file(StringIO(fasta_content))
 
-        try:
-            engine = MerPCR(wordsize=4)
-            engine.load_sts_file(sts_path)
-            records = engine.load_fasta_file(fasta_path)
-
-            hit_count = engine.search(records)
-            assert hit_count == 0
-
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        hit_count = engine.search(records)
+        assert hit_count == 0
 
-    def test_search_output_to_file(self):
+    def test_search_output_to_file(self, tiny_loaded_engine, tmp_path):
         """Test search output to file."""
-        sts_content = "TEST\tATCG\tCGAT\t20\tTest STS\n"
-        fasta_content = ">test\nATCGACGTATCGCGAT\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".out", delete=False) as out_f:
-            out_path = out_f.name
-
-        try:
-            engine = MerPCR(wordsize=4)
-            engine.load_sts_file(sts_path)
-            records = engine.load_fasta_file(fasta_path)
-
-            hit_count = engine.search(records, out_path)
+        engine, records = tiny_loaded_engine
+        out_path = tmp_path / "search.out"
 
-            # Check that output file was created
-            assert os.path.exists(out_path)
+        hit_count = engine.search(records, str(out_path))
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
-            if os.path.exists(out_path):
-                os.unlink(out_path)
+        # Check that output file was created
+        assert out_path.exists()
 
-    def test_search_stdout_handling(self):
-        """Test search output to stdout."""
-        sts_content = "TEST\tATCG\tCGAT\t20\tTest STS\n"
-        fasta_content = ">test\nATCGACGTATCGCGAT\n"
+    @pytest.mark.parametrize("output_file", ["stdout", None])
+    def test_search_stdout_handling(self, tiny_loaded_engine, capsys, output_file):
+        """Test search output to stdout, requested explicitly or by default."""
+        engine, records = tiny_loaded_engine
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
+        hit_count = engine.search(records, output_file)
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
+        output = capsys.readouterr().out
+        assert len(output.splitlines()) == hit_count
+        assert "TEST\tTest STS\t(+)" in output
 
-        try:
-            engine = MerPCR(wordsize=4)
-            engine.load_sts_file(sts_path)
-            records = engine.load_fasta_file(fasta_path)
+    def test_search_output_to_stream(self, tiny_loaded_engine):
+        """Test search writes hits to a caller-supplied stream and leaves it open."""
+        engine, records = tiny_loaded_engine
+        buf = StringIO()
 
-            # Test stdout handling
-            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
-                hit_count = engine.search(records, "stdout")
-                output = mock_stdout.getvalue()
+        hit_count = engine.search(records, buf)
 
-            # Test None output (should go to stdout)
-            with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
-                hit_count = engine.search(records, None)
-                output = mock_stdout.getvalue()
-
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        assert not buf.closed
+        output = buf.getvalue()
+        assert len(output.splitlines()) == hit_count
+        assert "TEST\tTest STS\t(+)" in output
 
 
 class TestThreadingBehavior:
     """Test threading behavior and decisions."""
 
-    def test_single_thread_for_small_sequences(self):
+    def test_single_thread_for_small_sequences(self, tiny_loaded_engine):
         """Test that small sequences use single thread."""
-        sts_content = "TEST\tATCG\tCGAT\t20\tTest STS\n"
-        fasta_content = ">small\nATCGCGAT\n"  # Very small sequence
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            engine = MerPCR(wordsize=4, threads=4)  # Request 4 threads
-            engine.load_sts_file(sts_path)
-            records = engine.load_fasta_file(fasta_path)
-
-            hit_count = engine.search(records)
-            # Should complete without error regardless of threading decision
-            assert hit_count >= 0
+        loaded_engine, records = tiny_loaded_engine
+        engine = copy.copy(loaded_engine)
+        engine.threads = 4  # Request 4 threads for a very small sequence
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        hit_count = engine.search(records)
+        # Should complete without error regardless of threading decision
+        assert hit_count >= 0
 
     def test_parameter_bounds_checking(self):
         """Test that search validates parameters."""
@@ -415,33 +336,15 @@ class TestThreadingBehavior:
         hit_count = engine.search([])
         assert hit_count == 0
 
-    def test_search_state_management(self):
+    def test_search_state_management(self, tiny_loaded_engine):
         """Test that search properly manages internal state."""
-        sts_content = "TEST\tATCG\tCGAT\t20\tTest STS\n"
-        fasta_content = ">test\nATCGACGTATCGCGAT\n"
+        engine, records = tiny_loaded_engine
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
+        # Run search
+        hit_count = engine.search(records)
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            engine = MerPCR(wordsize=4)
-            engine.load_sts_file(sts_path)
-            records = engine.load_fasta_file(fasta_path)
-
-            # Run search
-            hit_count = engine.search(records)
-
-            # Check that total_hits is set
-            assert engine.total_hits == hit_count
-
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        # Check that total_hits is set
+        assert engine.total_hits == hit_count
 
 
 class TestEdgeCases:
@@ -452,17 +355,9 @@ class TestEdgeCases:
         engine = MerPCR()
         fasta_content = ">test\nATCGATCG\n"
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            records = engine.load_fasta_file(fasta_path)
-            hit_count = engine.search(records)
-            assert hit_count == 0  # No STS data, should be 0 hits
-
-        finally:
-            os.unlink(fasta_path)
+        records = engine.load_fasta_file(StringIO(fasta_content))
+        hit_count = engine.search(records)
+        assert hit_count == 0  # No STS data, should be 0 hits
 
     def test_search_with_empty_sequences(self):
         """Test search with empty sequences."""
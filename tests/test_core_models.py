@@ -52,6 +52,14 @@ class TestSTSRecord(unittest.TestCase):
         self.assertEqual(sts.direct, "+")
         self.assertEqual(sts.ambig_primer, 0)
 
+    def test_sts_record_has_no_instance_dict(self):
+        """Test STS records use slots rather than a per-instance __dict__."""
+        sts = STSRecord(id="TEST003", primer1="ATCGATCG", primer2="CGATCGAT", pcr_size=150)
+
+        self.assertFalse(hasattr(sts, "__dict__"))
+        with self.assertRaises(AttributeError):
+            sts.unknown_field = 1
+
 
 @pytest.mark.unit
 class TestFASTARecord(unittest.TestCase):
@@ -87,6 +95,20 @@ class TestFASTARecord(unittest.TestCase):
 
         self.assertEqual(fasta.label, "gi|123456|gb|ABC123.1|")
 
+    def test_fasta_record_label_parsed_on_access(self):
+        """Test the defline is only parsed when the label is first read."""
+        fasta = FASTARecord(defline=">chr2 Homo sapiens chromosome 2", sequence="ACGT")
+
+        self.assertNotIn("label", vars(fasta))
+        self.assertEqual(fasta.label, "chr2")
+        self.assertEqual(vars(fasta)["label"], "chr2")
+
+    def test_fasta_record_empty_defline(self):
+        """Test a defline without any words gives an empty label."""
+        fasta = FASTARecord(defline=">", sequence="ACGT")
+
+        self.assertEqual(fasta.label, "")
+
 
 @pytest.mark.unit
 class TestSTSHit(unittest.TestCase):
@@ -103,6 +125,14 @@ class TestSTSHit(unittest.TestCase):
         self.assertEqual(hit.sts, sts)
         self.assertEqual(hit.sts.id, "TEST001")
 
+    def test_sts_hit_has_no_instance_dict(self):
+        """Test STS hits use slots rather than a per-instance __dict__."""
+        sts = STSRecord(id="TEST001", primer1="ATCG", primer2="CGAT", pcr_size=100)
+
+        hit = STSHit(pos1=100, pos2=200, sts=sts)
+
+        self.assertFalse(hasattr(hit, "__dict__"))
+
 
 @pytest.mark.unit
 class TestThreadData(unittest.TestCase):
@@ -128,6 +158,18 @@ class TestThreadData(unittest.TestCase):
         self.assertEqual(len(thread_data.hits), 1)
         self.assertEqual(thread_data.hits[0], hit)
 
+    def test_thread_data_survives_pickling(self):
+        """Test slotted thread data round-trips to and from worker processes."""
+        import pickle
+
+        sts = STSRecord(id="TEST", primer1="AT", primer2="GC", pcr_size=50)
+        thread_data = ThreadData(
+            thread_id=1, sequence="ATCG", offset=0, length=4, hits=[STSHit(10, 60, sts)]
+        )
+
+        self.assertFalse(hasattr(thread_data, "__dict__"))
+        self.assertEqual(pickle.loads(pickle.dumps(thread_data)), thread_data)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -13,186 +13,210 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from merpcr import MerPCR
 from merpcr.core.models import STSRecord, ThreadData
+from merpcr.core.utils import encode_sequence, hash_words
 
+# Engines are built once per module and shared between tests, so tests must
+# not change their settings.
 
-@pytest.mark.unit
-class TestHashFunctions(unittest.TestCase):
-    """Test hash computation functions."""
 
-    def setUp(self):
-        """Set up test engine."""
-        self.mer_pcr = MerPCR(wordsize=8)  # Use smaller wordsize for testing
+@pytest.fixture(scope="module")
+def engine8():
+    """Engine with a small wordsize for hash tests."""
+    return MerPCR(wordsize=8)
 
-    def test_hash_value_simple(self):
-        """Test hash computation for simple sequences."""
-        offset, hash_val = self.mer_pcr._hash_value("AAAAAAAA")
-        self.assertEqual(offset, 0)
-        self.assertEqual(hash_val, 0)  # All A's = 0000...
 
-        offset, hash_val = self.mer_pcr._hash_value("TTTTTTTT")
-        self.assertEqual(offset, 0)
-        self.assertEqual(hash_val, 65535)  # All T's = 1111... in binary for 8 bases
+@pytest.fixture(scope="module")
+def engine_cmp():
+    """Engine allowing one mismatch outside a two-base 3' region."""
+    return MerPCR(mismatches=1, three_prime_match=2)
 
-    def test_hash_value_mixed(self):
-        """Test hash computation for mixed sequences."""
-        offset, hash_val = self.mer_pcr._hash_value("ATCGATCG")
-        self.assertEqual(offset, 0)
-        # A=00, T=11, C=01, G=10 -> 00110110 00110110 = 0x3636
 
-        offset, hash_val = self.mer_pcr._hash_value("GCTAGCTA")
-        self.assertEqual(offset, 0)
-        # G=10, C=01, T=11, A=00 -> 10011100 10011100
+@pytest.fixture(scope="module")
+def engine_iupac():
+    """Engine with IUPAC matching and no mismatches."""
+    return MerPCR(iupac_mode=1, mismatches=0)
 
-    def test_hash_value_with_ambiguities(self):
-        """Test hash computation fails with ambiguous bases."""
-        offset, hash_val = self.mer_pcr._hash_value("ATCGATNG")
-        self.assertEqual(offset, -1)  # Should fail due to N
 
-        offset, hash_val = self.mer_pcr._hash_value("ATCGATCR")
-        self.assertEqual(offset, -1)  # Should fail due to R
+@pytest.fixture(scope="module")
+def engine_rc():
+    """Default engine for reverse complement tests."""
+    return MerPCR()
 
-    def test_hash_value_longer_sequence(self):
-        """Test hash computation with longer sequences."""
-        # Should find hash in the first valid position
-        offset, hash_val = self.mer_pcr._hash_value("ATCGATCGATCG")
-        self.assertEqual(offset, 0)  # Uses first 8 bases
 
-        # Should skip ambiguous start and find hash later
-        offset, hash_val = self.mer_pcr._hash_value("NNNATCGATCGATCG")
-        self.assertEqual(offset, 3)  # Skips the N's
+@pytest.mark.unit
+class TestHashFunctions:
+    """Test hash computation functions."""
 
-    def test_hash_value_too_short(self):
-        """Test hash computation with sequences too short."""
-        offset, hash_val = self.mer_pcr._hash_value("ATCG")  # Only 4 bases, need 8
-        self.assertEqual(offset, -1)
+    @pytest.mark.parametrize(
+        "primer,expected",
+        [
+            pytest.param("AAAAAAAA", (0, 0), id="all-A"),  # A=00 in every position
+            pytest.param("TTTTTTTT", (0, 65535), id="all-T"),  # T=11 in every position
+            # A=00, T=11, C=01, G=10 -> 00110110 00110110
+            pytest.param("ATCGATCG", (0, 0x3636), id="mixed"),
+            # G=10, C=01, T=11, A=00 -> 10011100 10011100
+            pytest.param("GCTAGCTA", (0, 0x9C9C), id="mixed-2"),
+            pytest.param("ATCGATCGATCG", (0, 0x3636), id="longer"),  # Uses first 8 bases
+            pytest.param("NNNATCGATCGATCG", (3, 0x3636), id="skips-ambiguous-start"),
+        ],
+    )
+    def test_hash_value(self, engine8, primer, expected):
+        """Test hash computation finds the first unambiguous word."""
+        assert engine8._hash_value(primer) == expected
+
+    @pytest.mark.parametrize(
+        "primer",
+        [
+            pytest.param("ATCGATNG", id="N"),
+            pytest.param("ATCGATCR", id="R"),
+            pytest.param("ATCG", id="too-short"),  # Only 4 bases, need 8
+        ],
+    )
+    def test_hash_value_unhashable(self, engine8, primer):
+        """Test hash computation fails without an unambiguous word."""
+        offset, hash_val = engine8._hash_value(primer)
+        assert offset == -1
+
+    def test_hash_words_matches_scalar(self, engine8):
+        """Test the rolling hash yields each unambiguous word's scalar hash."""
+        sequence = "NNNATCGATCGATCGnTTGCAuGGCCAAN"
+        words = list(hash_words(sequence, engine8.wordsize))
+
+        assert words[0] == engine8._hash_value("NNNATCGATCGATCG")
+        expected = [
+            (offset, engine8._hash_value(sequence[offset : offset + 8])[1])
+            for offset in range(len(sequence) - 7)
+            if engine8._hash_value(sequence[offset : offset + 8])[0] == 0
+        ]
+        assert words == expected
 
 
 @pytest.mark.unit
-class TestSequenceComparison(unittest.TestCase):
-    """Test sequence comparison functions."""
-
-    def setUp(self):
-        """Set up test engine."""
-        self.mer_pcr = MerPCR(mismatches=1, three_prime_match=2)
-
-    def test_exact_match(self):
-        """Test exact sequence matches."""
-        self.assertTrue(self.mer_pcr._compare_seqs("ATCG", "ATCG", "+"))
-        self.assertTrue(self.mer_pcr._compare_seqs("GGCCTTAA", "GGCCTTAA", "-"))
-
-    def test_mismatches_allowed(self):
-        """Test mismatches within tolerance."""
-        # One mismatch allowed, not in 3' region
-        self.assertTrue(
-            self.mer_pcr._compare_seqs("ATCGATCG", "TTCGATCG", "+")
-        )  # Mismatch at pos 0
-
-    def test_mismatches_3prime_protected(self):
-        """Test 3' protection prevents mismatches."""
-        # Mismatch in 3' protected region (last 2 bases for forward)
-        self.assertFalse(
-            self.mer_pcr._compare_seqs("ATCGATCG", "ATCGATCT", "+")
-        )  # Mismatch at pos 7 (last)
-        self.assertFalse(
-            self.mer_pcr._compare_seqs("ATCGATCG", "ATCGATAG", "+")
-        )  # Mismatch at pos 6 (second last)
-
-        # Mismatch in 3' protected region (first 2 bases for reverse)
-        self.assertFalse(
-            self.mer_pcr._compare_seqs("ATCGATCG", "TTCGATCG", "-")
-        )  # Mismatch at pos 0 (first)
-        self.assertFalse(
-            self.mer_pcr._compare_seqs("ATCGATCG", "AGCGATCG", "-")
-        )  # Mismatch at pos 1 (second)
-
-    def test_too_many_mismatches(self):
-        """Test rejection when too many mismatches."""
-        self.mer_pcr.mismatches = 1
-        # Two mismatches, only 1 allowed
-        self.assertFalse(self.mer_pcr._compare_seqs("ATCGATCG", "TTCGATCT", "+"))
-
-    def test_length_mismatch(self):
-        """Test rejection of different length sequences."""
-        self.assertFalse(self.mer_pcr._compare_seqs("ATCG", "ATCGA", "+"))
-        self.assertFalse(self.mer_pcr._compare_seqs("ATCGATCG", "ATCG", "+"))
-
-    def test_case_insensitive(self):
-        """Test case insensitive comparison."""
-        self.assertTrue(self.mer_pcr._compare_seqs("atcg", "ATCG", "+"))
-        self.assertTrue(self.mer_pcr._compare_seqs("AtCg", "aTcG", "+"))
+class TestSequenceComparison:
+    """Test sequence comparison functions (one mismatch allowed, 2-base 3' region)."""
+
+    @pytest.mark.parametrize(
+        "seq1,seq2,strand,expected",
+        [
+            pytest.param("ATCG", "ATCG", "+", True, id="exact"),
+            pytest.param("GGCCTTAA", "GGCCTTAA", "-", True, id="exact-reverse"),
+            pytest.param("ATCGATCG", "TTCGATCG", "+", True, id="mismatch-outside-3prime"),
+            # Mismatches in the 3' region: last 2 bases forward, first 2 reverse
+            pytest.param("ATCGATCG", "ATCGATCT", "+", False, id="3prime-last"),
+            pytest.param("ATCGATCG", "ATCGATAG", "+", False, id="3prime-second-last"),
+            pytest.param("ATCGATCG", "TTCGATCG", "-", False, id="3prime-reverse-first"),
+            pytest.param("ATCGATCG", "AGCGATCG", "-", False, id="3prime-reverse-second"),
+            pytest.param("ATCGATCG", "TTCGATCT", "+", False, id="too-many-mismatches"),
+            pytest.param("ATCG", "ATCGA", "+", False, id="length-longer"),
+            pytest.param("ATCGATCG", "ATCG", "+", False, id="length-shorter"),
+            pytest.param("atcg", "ATCG", "+", True, id="lowercase"),
+            pytest.param("AtCg", "aTcG", "+", True, id="mixed-case"),
+            # Sequences with N fall back to exact character comparison
+            pytest.param("ATNGATCG", "ATNGATCG", "+", True, id="N-identical"),
+            pytest.param("ATNGATCG", "ATCGATCG", "+", True, id="N-as-mismatch"),
+            pytest.param("ATCGATCN", "ATCGATCG", "+", False, id="N-in-3prime"),
+        ],
+    )
+    def test_compare_seqs(self, engine_cmp, seq1, seq2, strand, expected):
+        """Test comparison against the mismatch and 3' rules."""
+        assert engine_cmp._compare_seqs(seq1, seq2, strand) is expected
+
+    @pytest.mark.parametrize("strand", ["+", "-", "?"])  # "?" gets no 3' protection
+    @pytest.mark.parametrize(
+        "candidate", ["ATCGATCG", "TTCGATCG", "ATCGATCT", "AGCGATCG", "TTCGATCT", "ATCAATCG"]
+    )
+    def test_packed_matches_string_comparison(self, engine_cmp, candidate, strand):
+        """Test the packed fast path agrees with the character-by-character path."""
+        primer = "ATCGATCG"
+        packed = engine_cmp._compare_seqs(candidate, primer, strand)
+        # A code of -1 marks the primer as unpackable, forcing the string path
+        unpacked = engine_cmp._compare_seqs(candidate, primer, strand, -1)
+        assert packed == unpacked
+
+    @pytest.mark.parametrize("start,stop", [(0, 24), (3, 10), (12, 12), (10, 9)])
+    def test_packed_window_matches_string_scan(self, engine_cmp, start, stop):
+        """Test scanning a packed window finds the same primer positions as slicing."""
+        sequence = "ATCGATCGTTCGATCGATCGATCTAGCGATCGAAATCGATCG"
+        primer = "ATCGATCG"
+        packed = engine_cmp._matching_positions(
+            sequence, start, stop, primer, encode_sequence(primer)
+        )
+        unpacked = engine_cmp._matching_positions(sequence, start, stop, primer, -1)
+        assert packed == unpacked
+        assert packed == [
+            pos
+            for pos in range(start, stop + 1)
+            if engine_cmp._compare_seqs(sequence[pos : pos + 8], primer, "-")
+        ]
 
 
 @pytest.mark.unit
-class TestIUPACSupport(unittest.TestCase):
+class TestIUPACSupport:
     """Test IUPAC ambiguity code support."""
 
-    def setUp(self):
-        """Set up test engine with IUPAC mode."""
-        self.mer_pcr = MerPCR(iupac_mode=1, mismatches=0)
-
-    def test_iupac_matches(self):
-        """Test IUPAC ambiguity matches."""
-        # N matches any base
-        self.assertTrue(self.mer_pcr._compare_seqs("ATCG", "NTCG", "+"))
-        self.assertTrue(self.mer_pcr._compare_seqs("ATCG", "ANCG", "+"))
-        self.assertTrue(self.mer_pcr._compare_seqs("ATCG", "ATNG", "+"))
-        self.assertTrue(self.mer_pcr._compare_seqs("ATCG", "ATCN", "+"))
-
-        # R (A or G) matches A and G
-        self.assertTrue(self.mer_pcr._compare_seqs("ATCG", "RTCG", "+"))  # R matches A
-        self.assertTrue(self.mer_pcr._compare_seqs("GTCG", "RTCG", "+"))  # R matches G
-        self.assertFalse(self.mer_pcr._compare_seqs("CTCG", "RTCG", "+"))  # R doesn't match C
-
-        # Y (C or T) matches C and T
-        self.assertTrue(self.mer_pcr._compare_seqs("ATCG", "ATYG", "+"))  # Y matches C
-        self.assertTrue(self.mer_pcr._compare_seqs("ATTG", "ATYG", "+"))  # Y matches T
-
-    def test_iupac_no_match(self):
-        """Test IUPAC codes that don't match."""
-        # W (A or T) doesn't match C or G
-        self.assertFalse(self.mer_pcr._compare_seqs("ACCG", "AWCG", "+"))
-        self.assertFalse(self.mer_pcr._compare_seqs("AGCG", "AWCG", "+"))
+    @pytest.mark.parametrize(
+        "seq1,seq2,expected",
+        [
+            # N matches any base
+            ("ATCG", "NTCG", True),
+            ("ATCG", "ANCG", True),
+            ("ATCG", "ATNG", True),
+            ("ATCG", "ATCN", True),
+            # R (A or G) matches A and G, not C
+            ("ATCG", "RTCG", True),
+            ("GTCG", "RTCG", True),
+            ("CTCG", "RTCG", False),
+            # Y (C or T) matches C and T
+            ("ATCG", "ATYG", True),
+            ("ATTG", "ATYG", True),
+            # W (A or T) doesn't match C or G
+            ("ACCG", "AWCG", False),
+            ("AGCG", "AWCG", False),
+            # Codes are case-insensitive; unmapped symbols only match themselves
+            ("atcg", "rtck", True),
+            ("ATCX", "ATCX", True),
+            ("ATCG", "ATCX", False),
+        ],
+    )
+    def test_iupac_compare(self, engine_iupac, seq1, seq2, expected):
+        """Test IUPAC ambiguity codes match exactly the bases they stand for."""
+        assert engine_iupac._compare_seqs(seq1, seq2, "+") is expected
 
 
 @pytest.mark.unit
-class TestReverseComplement(unittest.TestCase):
+class TestReverseComplement:
     """Test reverse complement functionality."""
 
-    def setUp(self):
-        """Set up test engine."""
-        self.mer_pcr = MerPCR()
-
-    def test_simple_reverse_complement(self):
-        """Test reverse complement of simple sequences."""
-        self.assertEqual(self.mer_pcr._reverse_complement("A"), "T")
-        self.assertEqual(self.mer_pcr._reverse_complement("T"), "A")
-        self.assertEqual(self.mer_pcr._reverse_complement("C"), "G")
-        self.assertEqual(self.mer_pcr._reverse_complement("G"), "C")
-
-    def test_complex_reverse_complement(self):
-        """Test reverse complement of complex sequences."""
-        self.assertEqual(self.mer_pcr._reverse_complement("ATCG"), "CGAT")
-        self.assertEqual(self.mer_pcr._reverse_complement("GGCCTTAA"), "TTAAGGCC")
-        self.assertEqual(self.mer_pcr._reverse_complement("ATCGATCGATCG"), "CGATCGATCGAT")
-
-    def test_palindromic_sequences(self):
-        """Test reverse complement of palindromic sequences."""
-        self.assertEqual(self.mer_pcr._reverse_complement("ACGT"), "ACGT")
-        self.assertEqual(self.mer_pcr._reverse_complement("GATC"), "GATC")
-        self.assertEqual(self.mer_pcr._reverse_complement("AATT"), "AATT")
-
-    def test_ambiguous_bases(self):
-        """Test reverse complement with ambiguous bases."""
-        self.assertEqual(self.mer_pcr._reverse_complement("ATCGN"), "NCGAT")
-        self.assertEqual(self.mer_pcr._reverse_complement("RWYS"), "SRWY")
-        self.assertEqual(
-            self.mer_pcr._reverse_complement("BDHV"), "BDHV"
-        )  # These are self-complementary sets
-
-    def test_case_preservation(self):
-        """Test case preservation in reverse complement."""
-        self.assertEqual(self.mer_pcr._reverse_complement("atcg"), "cgat")
-        self.assertEqual(self.mer_pcr._reverse_complement("AtCg"), "cGaT")
+    @pytest.mark.parametrize(
+        "seq,expected",
+        [
+            ("A", "T"),
+            ("T", "A"),
+            ("C", "G"),
+            ("G", "C"),
+            ("ATCG", "CGAT"),
+            ("GGCCTTAA", "TTAAGGCC"),
+            ("ATCGATCGATCG", "CGATCGATCGAT"),
+            # Palindromes
+            ("ACGT", "ACGT"),
+            ("GATC", "GATC"),
+            ("AATT", "AATT"),
+            # Ambiguous bases
+            ("ATCGN", "NCGAT"),
+            ("RWYS", "SRWY"),
+            ("BDHV", "BDHV"),  # These are self-complementary sets
+            # Case is preserved
+            ("atcg", "cgat"),
+            ("AtCg", "cGaT"),
+            # Characters without a complement become N
+            ("AC-GT", "ACNGT"),
+            ("AC\u00e9GT", "ACNGT"),
+            ("", ""),
+        ],
+    )
+    def test_reverse_complement(self, engine_rc, seq, expected):
+        """Test reverse complement of plain, palindromic, ambiguous and mixed-case input."""
+        assert engine_rc._reverse_complement(seq) == expected
 
 
 @pytest.mark.unit
@@ -5,11 +5,10 @@ These tests simulate various system failures, I/O errors, and edge conditions
 to verify that merPCR handles failures gracefully and recovers properly.
 """
 
+import copy
 import errno
 import logging
-import os
 import sys
-import tempfile
 from io import StringIO
 from unittest.mock import MagicMock, Mock, mock_open, patch
 
@@ -24,6 +23,49 @@ from merpcr.io.sts import STSLoader
 # Disable logging for error injection tests to reduce noise
 logging.getLogger("merpcr").setLevel(logging.CRITICAL)
 
+# The tiny STS and FASTA inputs most tests in this module run against
+CANONICAL_STS = "TEST\tATCG\tCGAT\t50\n"
+CANONICAL_FASTA = ">test\nATCGCGAT\n"
+
+# An 80 kb single-sequence FASTA for the thread exhaustion test
+LARGE_FASTA = f">test\n{'ATCGCGAT' * 10000}"
+
+
+class RaisingHandler(logging.Handler):
+    """Logging handler that fails every emit, like a handler on a full disk."""
+
+    def __init__(self):
+        super().__init__()
+        self.emit_count = 0
+
+    def emit(self, record):
+        self.emit_count += 1
+        raise OSError("Logging failed")
+
+
+@pytest.fixture(scope="module")
+def canonical_files(tmp_path_factory):
+    """Paths (sts_path, fasta_path) of the canonical inputs, written once per module."""
+    base = tmp_path_factory.mktemp("canonical")
+    sts_path = base / "test.sts"
+    sts_path.write_text(CANONICAL_STS)
+    fasta_path = base / "test.fa"
+    fasta_path.write_text(CANONICAL_FASTA)
+    return sts_path, fasta_path
+
+
+@pytest.fixture(scope="module")
+def canonical_engine(canonical_files):
+    """A wordsize 4 MerPCR loaded with the canonical inputs once per module.
+
+    Returns (engine, records). Shared between tests: copy the engine before
+    changing its settings.
+    """
+    sts_path, fasta_path = canonical_files
+    engine = MerPCR(wordsize=4)
+    assert engine.load_sts_file(sts_path)
+    return engine, engine.load_fasta_file(fasta_path)
+
 
 class TestFileSystemErrorInjection:
     """Test filesystem error injection scenarios."""
@@ -59,181 +101,112 @@ class TestFileSystemErrorInjection:
                 # This is acceptable behavior
                 pass
 
-    def test_output_file_write_error(self):
+    def test_output_file_write_error(self, canonical_engine, tmp_path):
         """Test output file write errors during search."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
-        fasta_content = ">test\nATCGCGAT\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            engine = MerPCR(wordsize=4)
-            engine.load_sts_file(sts_path)
-            records = engine.load_fasta_file(fasta_path)
-
-            # Mock file opening to fail for output
-            with patch("builtins.open", side_effect=OSError("Disk full")):
-                try:
-                    hits = engine.search(records, "output.txt")
-                    # Should either handle gracefully or raise appropriate error
-                except OSError:
-                    # This is acceptable
-                    pass
+        engine, records = canonical_engine
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        # Mock file opening to fail for output
+        with patch("builtins.open", side_effect=OSError("Disk full")):
+            try:
+                hits = engine.search(records, str(tmp_path / "output.txt"))
+                # Should either handle gracefully or raise appropriate error
+            except OSError:
+                # This is acceptable
+                pass
 
-    def test_partial_file_read_error(self):
+    def test_partial_file_read_error(self, tmp_path):
         """Test handling of partial file reads."""
         # Create a file that will cause read errors
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write("TEST\tATCG\tCGAT\t50\n")
-            sts_path = f.name
-
-        try:
-            # Mock file read to fail partway through
-            original_open = open
-
-            def failing_open(*args, **kwargs):
-                if args[0] == sts_path:
-                    mock_file = MagicMock()
-                    mock_file.readlines.side_effect = OSError("I/O error")
-                    mock_file.__enter__.return_value = mock_file
-                    return mock_file
-                else:
-                    return original_open(*args, **kwargs)
-
-            with patch("builtins.open", side_effect=failing_open):
-                engine = MerPCR()
-                try:
-                    result = engine.load_sts_file(sts_path)
-                    assert not result
-                except OSError:
-                    # Acceptable behavior
-                    pass
-
-        finally:
-            os.unlink(sts_path)
-
-    def test_disk_full_during_output(self):
-        """Test handling disk full errors during output."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
-        fasta_content = ">test\nATCGCGAT\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
+        sts_path = tmp_path / "test.sts"
+        sts_path.write_text("TEST\tATCG\tCGAT\t50\n")
+
+        # Mock file read to fail partway through
+        original_open = open
+
+        def failing_open(*args, **kwargs):
+            if args[0] == sts_path:
+                mock_file = MagicMock()
+                mock_file.__iter__.side_effect = OSError("I/O error")
+                mock_file.__enter__.return_value = mock_file
+                return mock_file
+            else:
+                return original_open(*args, **kwargs)
 
-        try:
-            engine = MerPCR(wordsize=4)
-            engine.load_sts_file(sts_path)
-            records = engine.load_fasta_file(fasta_path)
+        with patch("builtins.open", side_effect=failing_open):
+            engine = MerPCR()
+            try:
+                result = engine.load_sts_file(sts_path)
+                assert not result
+            except OSError:
+                # Acceptable behavior
+                pass
 
-            # Mock print to fail (disk full scenario)
-            def failing_print(*args, **kwargs):
-                if "file" in kwargs:
-                    raise OSError(errno.ENOSPC, "No space left on device")
-                return print(*args, **kwargs)
+    def test_disk_full_during_output(self, canonical_engine):
+        """Test disk full errors while writing hits reach the caller."""
+        engine, records = canonical_engine
 
-            with patch("builtins.print", side_effect=failing_print):
-                try:
-                    hits = engine.search(records, "output.txt")
-                except OSError as e:
-                    assert e.errno == errno.ENOSPC
+        class FullDisk(StringIO):
+            def write(self, text):
+                raise OSError(errno.ENOSPC, "No space left on device")
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        with pytest.raises(OSError) as excinfo:
+            engine.search(records, FullDisk())
+        assert excinfo.value.errno == errno.ENOSPC
 
 
 class TestMemoryErrorInjection:
     """Test memory-related error injection."""
 
     def test_memory_allocation_failure(self):
-        """Test handling of memory allocation failures."""
-        # Create large data that might cause memory issues
-        large_sts = []
-        for i in range(10000):
-            large_sts.append(f"STS{i}\t{'A'*20}\t{'T'*20}\t100")
+        """Test a MemoryError while building STS records reaches the caller."""
+        primers = f"{'A' * 20}\t{'T' * 20}"
+        sts_content = "\n".join(f"STS{i}\t{primers}\t100" for i in range(10))
 
-        sts_content = "\n".join(large_sts)
+        # Fail the sixth record, counting calls on the mock itself
+        original_create = STSLoader._create_sts_records
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(sts_content)
-            sts_path = f.name
+        def create_until_exhausted(loader, *args):
+            if create.call_count > 5:
+                raise MemoryError("Out of memory")
+            return original_create(loader, *args)
 
-        try:
-            # Mock list creation to fail after certain size
-            original_list = list
-            call_count = 0
-
-            def memory_limited_list(*args, **kwargs):
-                nonlocal call_count
-                call_count += 1
-                if call_count > 100:  # Simulate memory exhaustion
-                    raise MemoryError("Out of memory")
-                return original_list(*args, **kwargs)
-
-            with patch("builtins.list", side_effect=memory_limited_list):
-                engine = MerPCR()
-                try:
-                    result = engine.load_sts_file(sts_path)
-                    # Should either succeed or fail gracefully
-                except MemoryError:
-                    # This is acceptable behavior
-                    pass
+        with patch.object(
+            STSLoader, "_create_sts_records", autospec=True, side_effect=create_until_exhausted
+        ) as create:
+            engine = MerPCR()
+            with pytest.raises(MemoryError):
+                engine.load_sts_file(StringIO(sts_content))
 
-        finally:
-            os.unlink(sts_path)
+        assert create.call_count == 6
+        assert engine.sts_records == []
 
     def test_string_processing_memory_error(self):
         """Test memory errors during string processing."""
         # Create data that requires string processing
         fasta_content = f">huge_seq\n{'ATCG' * 100000}\n"  # 400KB sequence
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as f:
-            f.write(fasta_content)
-            fasta_path = f.name
+        # Simulate memory exhaustion by triggering it directly
+        original_init = FASTARecord.__init__
+        call_count = 0
 
-        try:
-            # Simulate memory exhaustion by triggering it directly
-            from merpcr.core.models import FASTARecord
-
-            original_init = FASTARecord.__init__
-            call_count = 0
-
-            def failing_init(self, defline, sequence):
-                nonlocal call_count
-                call_count += 1
-                # Simulate memory error for large sequences
-                if len(sequence) > 200000:  # Very large sequence
-                    raise MemoryError("Cannot allocate memory for large sequence")
-                return original_init(self, defline, sequence)
-
-            with patch.object(FASTARecord, "__init__", failing_init):
-                engine = MerPCR()
-                try:
-                    records = engine.load_fasta_file(fasta_path)
-                    # If successful, verify basic properties
-                    assert isinstance(records, list)
-                    assert len(records) >= 0  # May be empty if memory error
-                except MemoryError:
-                    # Expected behavior - memory error handled gracefully
-                    pass
+        def failing_init(self, defline, sequence):
+            nonlocal call_count
+            call_count += 1
+            # Simulate memory error for large sequences
+            if len(sequence) > 200000:  # Very large sequence
+                raise MemoryError("Cannot allocate memory for large sequence")
+            return original_init(self, defline, sequence)
 
-        finally:
-            os.unlink(fasta_path)
+        with patch.object(FASTARecord, "__init__", failing_init):
+            engine = MerPCR()
+            try:
+                records = engine.load_fasta_file(StringIO(fasta_content))
+                # If successful, verify basic properties
+                assert isinstance(records, list)
+                assert len(records) >= 0  # May be empty if memory error
+            except MemoryError:
+                # Expected behavior - memory error handled gracefully
+                pass
 
 
 class TestCLIErrorInjection:
@@ -252,229 +225,175 @@ class TestCLIErrorInjection:
                 # These are acceptable for corrupted input
                 pass
 
-    def test_cli_with_signal_interruption(self):
+    def test_cli_with_signal_interruption(self, canonical_files):
         """Test CLI behavior with simulated signal interruption."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
-        fasta_content = ">test\nATCGCGAT\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            # Simulate KeyboardInterrupt during execution
-            with patch("sys.argv", ["merpcr", sts_path, fasta_path, "-W", "4"]):
-                with patch("merpcr.core.engine.MerPCR.search", side_effect=KeyboardInterrupt()):
-                    try:
-                        result = main()
-                        # Should handle interruption
-                    except KeyboardInterrupt:
-                        # This is acceptable behavior
-                        pass
+        sts_path, fasta_path = canonical_files
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        # Simulate KeyboardInterrupt during execution
+        with patch("sys.argv", ["merpcr", str(sts_path), str(fasta_path), "-W", "4"]):
+            with patch("merpcr.core.engine.MerPCR.search", side_effect=KeyboardInterrupt()):
+                try:
+                    result = main()
+                    # Should handle interruption
+                except KeyboardInterrupt:
+                    # This is acceptable behavior
+                    pass
 
-    def test_cli_with_logging_errors(self):
+    def test_cli_with_logging_errors(self, canonical_files):
         """Test CLI behavior when logging fails."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
-        fasta_content = ">test\nATCGCGAT\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
+        sts_path, fasta_path = canonical_files
 
+        # Verbose mode so the loaders' info messages reach the failing handler
+        argv = ["merpcr", str(sts_path), str(fasta_path), "-W", "4", "-Q", "0"]
+        logger = logging.getLogger("merpcr")
+        handler = RaisingHandler()
+        logger.addHandler(handler)
         try:
-            # Mock logging to fail
-            with patch("logging.getLogger") as mock_logger:
-                mock_logger.return_value.error.side_effect = OSError("Logging failed")
-                mock_logger.return_value.info.side_effect = OSError("Logging failed")
-
-                with patch("sys.argv", ["merpcr", sts_path, fasta_path, "-W", "4"]):
-                    try:
-                        result = main()
-                        # Should complete despite logging errors
-                    except OSError:
-                        # Acceptable if logging errors propagate
-                        pass
-
+            with patch("sys.argv", argv):
+                exit_code = main()
+        except OSError:
+            exit_code = None  # The failure surfaced to the caller instead
         finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+            logger.removeHandler(handler)
+
+        # The failing handler was reached, and the run did not report success
+        assert handler.emit_count > 0
+        assert exit_code != 0
+
+
+# Corrupted-input tests are module-level functions so that each variant is an
+# independent test node, which pytest-xdist can schedule on any worker
+
+
+@pytest.mark.parametrize(
+    "corrupted_sts",
+    [
+        pytest.param("TEST\t\t\t\n", id="empty-fields"),
+        pytest.param("TEST\tATCG\n", id="missing-fields"),
+        pytest.param("TEST\tATCG\tCGAT\tNOT_A_NUMBER\n", id="invalid-pcr-size"),
+        pytest.param("TEST\tATCG\tCGAT\t-100\n", id="negative-pcr-size"),
+        pytest.param("\tATCG\tCGAT\t100\n", id="empty-id"),
+        pytest.param("TEST\t\tCGAT\t100\n", id="empty-primer1"),
+        pytest.param("TEST\tATCG\t\t100\n", id="empty-primer2"),
+        pytest.param("TEST\tXXXXXXXXXXXXXXXX\tCGAT\t100\n", id="invalid-primer-chars"),
+    ],
+)
+def test_corrupted_sts_file_data(corrupted_sts):
+    """Test handling of corrupted STS file data."""
+    engine = MerPCR()
+    # Should handle corrupted data gracefully
+    try:
+        result = engine.load_sts_file(StringIO(corrupted_sts))
+        # May succeed (skipping bad entries) or fail gracefully
+    except (ValueError, IndexError, TypeError):
+        # These are acceptable for corrupted data
+        pass
+
+
+@pytest.mark.parametrize(
+    "corrupted_fasta",
+    [
+        pytest.param("", id="empty-file"),
+        pytest.param("not a fasta file\n", id="invalid-format"),
+        pytest.param(">seq1\n", id="header-only"),
+        pytest.param("ATCGATCG\n", id="no-header"),
+        pytest.param(">seq1\nATCG\n>seq2\n", id="incomplete-entry"),
+        pytest.param(">seq1\nATCGXYZ123\n", id="invalid-sequence-chars"),
+        pytest.param(">\n\nATCGATCG\n", id="empty-header"),
+    ],
+)
+def test_corrupted_fasta_file_data(corrupted_fasta):
+    """Test handling of corrupted FASTA file data."""
+    engine = MerPCR()
+    # Should handle corrupted data gracefully
+    try:
+        records = engine.load_fasta_file(StringIO(corrupted_fasta))
+        # May return empty list or partial results
+        assert isinstance(records, list)
+    except (ValueError, IndexError):
+        # These are acceptable for corrupted data
+        pass
 
 
 class TestDataCorruptionInjection:
     """Test handling of corrupted data."""
 
-    def test_corrupted_sts_file_data(self):
-        """Test handling of corrupted STS file data."""
-        # Various forms of corrupted STS data
-        corrupted_sts_variants = [
-            "TEST\t\t\t\n",  # Empty fields
-            "TEST\tATCG\n",  # Missing fields
-            "TEST\tATCG\tCGAT\tNOT_A_NUMBER\n",  # Invalid PCR size
-            "TEST\tATCG\tCGAT\t-100\n",  # Negative PCR size
-            "\tATCG\tCGAT\t100\n",  # Empty ID
-            "TEST\t\tCGAT\t100\n",  # Empty primer1
-            "TEST\tATCG\t\t100\n",  # Empty primer2
-            "TEST\tXXXXXXXXXXXXXXXX\tCGAT\t100\n",  # Invalid characters in primer
-        ]
-
-        for corrupted_sts in corrupted_sts_variants:
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-                f.write(corrupted_sts)
-                sts_path = f.name
-
-            try:
-                engine = MerPCR()
-                # Should handle corrupted data gracefully
-                try:
-                    result = engine.load_sts_file(sts_path)
-                    # May succeed (skipping bad entries) or fail gracefully
-                except (ValueError, IndexError, TypeError):
-                    # These are acceptable for corrupted data
-                    pass
-
-            finally:
-                os.unlink(sts_path)
-
-    def test_corrupted_fasta_file_data(self):
-        """Test handling of corrupted FASTA file data."""
-        corrupted_fasta_variants = [
-            "",  # Empty file
-            "not a fasta file\n",  # Invalid format
-            ">seq1\n",  # Header without sequence
-            "ATCGATCG\n",  # Sequence without header
-            ">seq1\nATCG\n>seq2\n",  # Incomplete entry
-            ">seq1\nATCGXYZ123\n",  # Invalid characters in sequence
-            ">\n\nATCGATCG\n",  # Empty header
-        ]
-
-        for corrupted_fasta in corrupted_fasta_variants:
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as f:
-                f.write(corrupted_fasta)
-                fasta_path = f.name
-
-            try:
-                engine = MerPCR()
-                # Should handle corrupted data gracefully
-                try:
-                    records = engine.load_fasta_file(fasta_path)
-                    # May return empty list or partial results
-                    assert isinstance(records, list)
-                except (ValueError, IndexError):
-                    # These are acceptable for corrupted data
-                    pass
-
-            finally:
-                os.unlink(fasta_path)
-
-    def test_binary_file_as_text(self):
+    def test_binary_file_as_text(self, tmp_path):
         """Test handling of binary files passed as text files."""
         # Create a binary file
         binary_data = bytes([i % 256 for i in range(1000)])
 
-        with tempfile.NamedTemporaryFile(mode="wb", suffix=".sts", delete=False) as f:
-            f.write(binary_data)
-            sts_path = f.name
+        sts_path = tmp_path / "test.sts"
+        sts_path.write_bytes(binary_data)
 
+        engine = MerPCR()
+        # Should handle binary data gracefully
         try:
-            engine = MerPCR()
-            # Should handle binary data gracefully
-            try:
-                result = engine.load_sts_file(sts_path)
-                # Should fail gracefully
-                assert not result
-            except (UnicodeDecodeError, UnicodeError):
-                # These are acceptable for binary data
-                pass
-
-        finally:
-            os.unlink(sts_path)
+            result = engine.load_sts_file(sts_path)
+            # Should fail gracefully
+            assert not result
+        except (UnicodeDecodeError, UnicodeError):
+            # These are acceptable for binary data
+            pass
 
 
 class TestSystemResourceExhaustion:
     """Test behavior under system resource exhaustion."""
 
-    def test_file_descriptor_exhaustion(self):
+    def test_file_descriptor_exhaustion(self, tmp_path):
         """Test behavior when file descriptors are exhausted."""
         sts_content = "TEST\tATCG\tCGAT\t50\n"
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(sts_content)
-            sts_path = f.name
+        sts_path = tmp_path / "test.sts"
+        sts_path.write_text(sts_content)
 
-        try:
-            # Mock open to fail with "too many open files"
-            call_count = 0
-            original_open = open
-
-            def fd_limited_open(*args, **kwargs):
-                nonlocal call_count
-                call_count += 1
-                if call_count > 3:  # Allow a few opens, then fail
-                    raise OSError(errno.EMFILE, "Too many open files")
-                return original_open(*args, **kwargs)
+        # Mock open to fail with "too many open files"
+        call_count = 0
+        original_open = open
 
-            with patch("builtins.open", side_effect=fd_limited_open):
-                engine = MerPCR()
-                try:
-                    result = engine.load_sts_file(sts_path)
-                    # Should handle FD exhaustion gracefully
-                except OSError as e:
-                    assert e.errno == errno.EMFILE
+        def fd_limited_open(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            if call_count > 3:  # Allow a few opens, then fail
+                raise OSError(errno.EMFILE, "Too many open files")
+            return original_open(*args, **kwargs)
 
-        finally:
-            os.unlink(sts_path)
+        with patch("builtins.open", side_effect=fd_limited_open):
+            engine = MerPCR()
+            try:
+                result = engine.load_sts_file(sts_path)
+                # Should handle FD exhaustion gracefully
+            except OSError as e:
+                assert e.errno == errno.EMFILE
 
-    def test_process_limit_exhaustion(self):
+    @pytest.mark.slow
+    def test_process_limit_exhaustion(self, canonical_files, tmp_path):
         """Test behavior under process/thread limit exhaustion."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
-        sequence = ("ATCGCGAT") * 10000  # Large enough to trigger threading
-        fasta_content = f">test\n{sequence}"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
+        sts_path, _ = canonical_files
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
+        fasta_path = tmp_path / "test.fa"
+        fasta_path.write_text(LARGE_FASTA)
 
-        try:
-            # Mock ThreadPoolExecutor to fail
-            with patch("concurrent.futures.ThreadPoolExecutor") as mock_executor:
-                mock_executor.side_effect = OSError("Cannot create thread")
-
-                engine = MerPCR(wordsize=4, threads=4)
-                engine.load_sts_file(sts_path)
-                records = engine.load_fasta_file(fasta_path)
+        # Mock ThreadPoolExecutor to fail
+        with patch("concurrent.futures.ThreadPoolExecutor") as mock_executor:
+            mock_executor.side_effect = OSError("Cannot create thread")
 
-                try:
-                    hits = engine.search(records)
-                    # Should fall back to single-threaded or handle gracefully
-                except OSError:
-                    # Acceptable behavior
-                    pass
+            engine = MerPCR(wordsize=4, threads=4)
+            engine.load_sts_file(sts_path)
+            records = engine.load_fasta_file(fasta_path)
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+            try:
+                hits = engine.search(records)
+                # Should fall back to single-threaded or handle gracefully
+            except OSError:
+                # Acceptable behavior
+                pass
 
 
 class TestRecoveryMechanisms:
     """Test error recovery mechanisms."""
 
-    def test_partial_failure_recovery(self):
+    def test_partial_failure_recovery(self, tmp_path):
         """Test recovery from partial failures."""
         # Create mixed good and bad STS entries
         mixed_sts = """GOOD1\tATCG\tCGAT\t50
@@ -483,53 +402,32 @@ GOOD2\tTACG\tGTCA\t60
 \tEMPTY_ID\tCGAT\t70
 GOOD3\tGCTA\tTAGC\t80"""
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(mixed_sts)
-            sts_path = f.name
-
-        try:
-            engine = MerPCR()
-            result = engine.load_sts_file(sts_path)
+        sts_path = tmp_path / "test.sts"
+        sts_path.write_text(mixed_sts)
 
-            # Should recover by skipping bad entries and loading good ones
-            if result:
-                assert len(engine.sts_records) > 0
-                # Should have loaded at least the good entries
-                assert len(engine.sts_records) >= 2  # At least GOOD1 and GOOD2/GOOD3
+        engine = MerPCR()
+        result = engine.load_sts_file(sts_path)
 
-        finally:
-            os.unlink(sts_path)
+        # Should recover by skipping bad entries and loading good ones
+        if result:
+            assert len(engine.sts_records) > 0
+            # Should have loaded at least the good entries
+            assert len(engine.sts_records) >= 2  # At least GOOD1 and GOOD2/GOOD3
 
-    def test_graceful_degradation(self):
+    def test_graceful_degradation(self, canonical_engine):
         """Test graceful degradation when optional features fail."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
-        fasta_content = ">test\nATCGCGAT\n"
+        engine, records = canonical_engine
+        engine = copy.copy(engine)
+        engine.threads = 4
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            # Mock threading to fail, should fall back to single-threaded
-            with patch(
-                "concurrent.futures.ThreadPoolExecutor", side_effect=Exception("Threading failed")
-            ):
-                engine = MerPCR(wordsize=4, threads=4)
-                engine.load_sts_file(sts_path)
-                records = engine.load_fasta_file(fasta_path)
-
-                # Should still complete search, possibly single-threaded
-                hits = engine.search(records)
-                assert isinstance(hits, int)
-                assert hits >= 0
-
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        # Mock threading to fail, should fall back to single-threaded
+        with patch(
+            "concurrent.futures.ThreadPoolExecutor", side_effect=Exception("Threading failed")
+        ):
+            # Should still complete search, possibly single-threaded
+            hits = engine.search(records)
+            assert isinstance(hits, int)
+            assert hits >= 0
 
     def test_error_reporting_robustness(self):
         """Test that error reporting itself is robust."""
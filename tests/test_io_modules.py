@@ -3,51 +3,42 @@
 Tests for IO modules.
 """
 
-import os
-import sys
-import tempfile
-import unittest
+import io
+import logging
+from collections import Counter
+from unittest.mock import patch
 
 import pytest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
+from merpcr import MerPCR
 from merpcr.core.models import FASTARecord
+from merpcr.core.utils import encode_sequence, hash_value
 from merpcr.io.fasta import FASTALoader
+from merpcr.io.sts import STSLoader
 
 
-@pytest.mark.unit
-class TestFASTALoader(unittest.TestCase):
-    """Tests for FASTA file loading."""
+@pytest.fixture(scope="module")
+def engine():
+    """A default MerPCR shared by the STS loading tests.
 
-    def setUp(self):
-        """Set up test files."""
-        self.temp_files = []
+    Every load replaces the engine's records, so tests only need to load
+    their own input before checking it.
+    """
+    return MerPCR()
 
-    def tearDown(self):
-        """Clean up test files."""
-        for temp_file in self.temp_files:
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
 
-    def create_temp_fasta(self, content):
-        """Create a temporary FASTA file."""
-        fd, temp_file = tempfile.mkstemp(suffix=".fa")
-        with os.fdopen(fd, "w") as f:
-            f.write(content)
-        self.temp_files.append(temp_file)
-        return temp_file
+@pytest.mark.unit
+class TestFASTALoader:
+    """Tests for FASTA file loading."""
 
     def test_single_sequence(self):
         """Test loading a single sequence."""
         content = ">seq1\nATCGATCG\n"
-        temp_file = self.create_temp_fasta(content)
+        records = FASTALoader.load_stream(io.StringIO(content))
 
-        records = FASTALoader.load_file(temp_file)
-
-        self.assertEqual(len(records), 1)
-        self.assertEqual(records[0].label, "seq1")
-        self.assertEqual(records[0].sequence, "ATCGATCG")
+        assert len(records) == 1
+        assert records[0].label == "seq1"
+        assert records[0].sequence == "ATCGATCG"
 
     def test_multiple_sequences(self):
         """Test loading multiple sequences."""
@@ -59,17 +50,15 @@ GGCCTTAA
 AAAACCCC
 TTTTGGGG
 """
-        temp_file = self.create_temp_fasta(content)
-
-        records = FASTALoader.load_file(temp_file)
+        records = FASTALoader.load_stream(io.StringIO(content))
 
-        self.assertEqual(len(records), 3)
-        self.assertEqual(records[0].label, "seq1")
-        self.assertEqual(records[0].sequence, "ATCGATCG")
-        self.assertEqual(records[1].label, "seq2")
-        self.assertEqual(records[1].sequence, "GGCCTTAA")
-        self.assertEqual(records[2].label, "seq3")
-        self.assertEqual(records[2].sequence, "AAAACCCCTTTTGGGG")
+        assert len(records) == 3
+        assert records[0].label == "seq1"
+        assert records[0].sequence == "ATCGATCG"
+        assert records[1].label == "seq2"
+        assert records[1].sequence == "GGCCTTAA"
+        assert records[2].label == "seq3"
+        assert records[2].sequence == "AAAACCCCTTTTGGGG"
 
     def test_multiline_sequence(self):
         """Test sequences split across multiple lines."""
@@ -78,12 +67,10 @@ AAAATTTT
 CCCCGGGG
 TTTTAAAA
 """
-        temp_file = self.create_temp_fasta(content)
-
-        records = FASTALoader.load_file(temp_file)
+        records = FASTALoader.load_stream(io.StringIO(content))
 
-        self.assertEqual(len(records), 1)
-        self.assertEqual(records[0].sequence, "AAAATTTTCCCCGGGGTTTTAAAA")
+        assert len(records) == 1
+        assert records[0].sequence == "AAAATTTTCCCCGGGGTTTTAAAA"
 
     def test_sequence_filtering(self):
         """Test that non-nucleotide characters are filtered."""
@@ -91,34 +78,37 @@ TTTTAAAA
 ATCG123NNNN456ATCG
 WXYZ789GCTA
 """
-        temp_file = self.create_temp_fasta(content)
+        records = FASTALoader.load_stream(io.StringIO(content))
 
-        records = FASTALoader.load_file(temp_file)
-
-        self.assertEqual(len(records), 1)
+        assert len(records) == 1
         # Should keep valid nucleotides including ambiguity codes
-        self.assertEqual(records[0].sequence, "ATCGNNNNATCGWXYGCTA")
+        assert records[0].sequence == "ATCGNNNNATCGWXYGCTA"
 
-    def test_empty_file(self):
-        """Test loading empty file."""
-        temp_file = self.create_temp_fasta("")
+    def test_sequence_filtering_preserves_case(self):
+        """Test that filtering keeps lowercase nucleotides unchanged."""
+        content = ">mixed\natcg 12 nnAC-gt\n"
+        records = FASTALoader.load_stream(io.StringIO(content))
 
-        records = FASTALoader.load_file(temp_file)
+        assert records[0].sequence == "atcgnnACgt"
 
-        self.assertEqual(len(records), 0)
+    def test_empty_file(self, caplog):
+        """Test loading empty file."""
+        with caplog.at_level(logging.ERROR, logger="merpcr"):
+            records = FASTALoader.load_stream(io.StringIO(""))
+
+        assert len(records) == 0
+        assert "is empty" in caplog.text
 
     def test_no_sequences(self):
         """Test file with headers but no sequences."""
         content = ">seq1\n>seq2\n"
-        temp_file = self.create_temp_fasta(content)
-
-        records = FASTALoader.load_file(temp_file)
+        records = FASTALoader.load_stream(io.StringIO(content))
 
-        self.assertEqual(len(records), 2)
-        self.assertEqual(records[0].label, "seq1")
-        self.assertEqual(records[0].sequence, "")
-        self.assertEqual(records[1].label, "seq2")
-        self.assertEqual(records[1].sequence, "")
+        assert len(records) == 2
+        assert records[0].label == "seq1"
+        assert records[0].sequence == ""
+        assert records[1].label == "seq2"
+        assert records[1].sequence == ""
 
     def test_blank_lines(self):
         """Test handling of blank lines."""
@@ -134,94 +124,187 @@ GCTA
 AAAA
 
 """
-        temp_file = self.create_temp_fasta(content)
+        records = FASTALoader.load_stream(io.StringIO(content))
 
-        records = FASTALoader.load_file(temp_file)
-
-        self.assertEqual(len(records), 2)
-        self.assertEqual(records[0].sequence, "ATCGGCTA")
-        self.assertEqual(records[1].sequence, "AAAA")
+        assert len(records) == 2
+        assert records[0].sequence == "ATCGGCTA"
+        assert records[1].sequence == "AAAA"
 
     def test_nonexistent_file(self):
         """Test loading nonexistent file."""
-        with self.assertRaises(FileNotFoundError):
-            records = FASTALoader.load_file("/nonexistent/file.fa")
+        with pytest.raises(FileNotFoundError):
+            FASTALoader.load_file("/nonexistent/file.fa")
 
 
 @pytest.mark.integration
-class TestSTSLoader(unittest.TestCase):
+class TestSTSLoader:
     """Tests for STS file loading functionality."""
 
-    def setUp(self):
-        """Set up test environment."""
-        # We'll test STS loading through the main MerPCR class
-        # since STSLoader is tightly integrated
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-        from merpcr import MerPCR
-
-        self.mer_pcr = MerPCR()
-        self.temp_files = []
-
-    def tearDown(self):
-        """Clean up test files."""
-        for temp_file in self.temp_files:
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
-
-    def create_temp_sts(self, content):
-        """Create a temporary STS file."""
-        fd, temp_file = tempfile.mkstemp(suffix=".sts")
-        with os.fdopen(fd, "w") as f:
-            f.write(content)
-        self.temp_files.append(temp_file)
-        return temp_file
-
-    def test_basic_sts_loading(self):
+    def test_basic_sts_loading(self, engine):
         """Test basic STS file loading."""
         content = "TEST001\tATCGATCGATCG\tCGATCGATCGAT\t200\tTest STS\n"
-        temp_file = self.create_temp_sts(content)
+        stream = io.StringIO(content)
 
-        success = self.mer_pcr.load_sts_file(temp_file)
+        success = engine.load_sts_file(stream)
 
-        self.assertTrue(success)
+        assert success
         # Should have 2 records (forward and reverse)
-        self.assertEqual(len(self.mer_pcr.sts_records), 2)
+        assert len(engine.sts_records) == 2
 
-    def test_sts_range_parsing(self):
+    def test_sts_range_parsing(self, engine):
         """Test STS with size ranges."""
         content = "TEST001\tATCGATCGATCG\tCGATCGATCGAT\t150-250\tTest STS\n"
-        temp_file = self.create_temp_sts(content)
+        stream = io.StringIO(content)
 
-        success = self.mer_pcr.load_sts_file(temp_file)
+        success = engine.load_sts_file(stream)
 
-        self.assertTrue(success)
+        assert success
         # Should use average of range: (150+250)/2 = 200
-        for record in self.mer_pcr.sts_records:
+        for record in engine.sts_records:
             if record.direct == "+":
-                self.assertEqual(record.pcr_size, 200)
-
-    def test_invalid_sts_format(self):
+                assert record.pcr_size == 200
+
+    @pytest.mark.parametrize(
+        "pcr_size_str,expected",
+        [
+            ("200", 200),
+            ("150-250", 200),
+            (" 100 - 300 ", 200),
+            ("0", 240),
+            ("0-0", 240),
+            ("-5", 240),
+            ("150-", 240),
+            ("1-2-3", 240),
+            ("abc", 240),
+            ("", 240),
+            ("+5", 240),
+            ("1_000", 240),
+            ("\u0663\u0660\u0660", 240),  # Arabic-Indic 300
+            ("100-\u0663\u0660\u0660", 240),
+        ],
+    )
+    def test_pcr_size_parsing(self, pcr_size_str, expected):
+        """Test PCR size fields, falling back to the default when unusable."""
+        loader = STSLoader(11, 50, 240)
+        assert loader._parse_pcr_size(pcr_size_str) == expected
+
+    def test_packed_primer_codes(self, engine):
+        """Test primers are packed into 2-bit codes at load time."""
+        content = "TEST001\tATCGATCGATCG\tCGATCGATCGAN\t200\tTest STS\n"
+        stream = io.StringIO(content)
+
+        success = engine.load_sts_file(stream)
+
+        assert success
+        for record in engine.sts_records:
+            assert record.primer1_code == encode_sequence(record.primer1)
+            assert record.primer2_code == encode_sequence(record.primer2)
+
+        forward = [r for r in engine.sts_records if r.direct == "+"][0]
+        reverse = [r for r in engine.sts_records if r.direct == "-"][0]
+        assert forward.ambig_primer == 2  # primer2 contains an N
+        assert reverse.ambig_primer == 1  # ...which is primer1 when reversed
+
+    def test_invalid_sts_format(self, engine, caplog):
         """Test handling of invalid STS format."""
         content = "INVALID\tONLY_TWO_FIELDS\n"
-        temp_file = self.create_temp_sts(content)
+        stream = io.StringIO(content)
 
-        with self.assertLogs(level="ERROR") as cm:
-            success = self.mer_pcr.load_sts_file(temp_file)
+        with caplog.at_level(logging.ERROR, logger="merpcr"):
+            success = engine.load_sts_file(stream)
 
-        self.assertFalse(success)
+        assert not success
+        assert "Bad STS file format at line 1" in caplog.text
 
-    def test_short_primers(self):
+    def test_short_primers(self, engine):
         """Test handling of primers too short for word size."""
         content = "TEST001\tAT\tGC\t100\tToo short\n"
-        temp_file = self.create_temp_sts(content)
+        stream = io.StringIO(content)
 
-        success = self.mer_pcr.load_sts_file(temp_file)
+        success = engine.load_sts_file(stream)
 
-        self.assertTrue(success)
+        assert success
         # Should have 0 records due to short primers being filtered
-        self.assertEqual(len(self.mer_pcr.sts_records), 0)
+        assert len(engine.sts_records) == 0
 
-    def test_comments_and_blank_lines(self):
+    def test_ambiguous_primers_reported(self, engine, caplog):
+        """Test primers without a hashable word are counted in the warning."""
+        content = "TEST001\tATCGATCGATCG\tNNNNNNNNNNNN\t200\tTest STS\n"
+        stream = io.StringIO(content)
+
+        with caplog.at_level(logging.WARNING, logger="merpcr.io.sts"):
+            success = engine.load_sts_file(stream)
+
+        assert success
+        assert len(engine.sts_records) == 1
+        assert "1 primers have ambiguities" in caplog.text
+
+    def test_hash_table_buckets(self, engine):
+        """Test the hash table holds every record in a read-only bucket."""
+        content = "TEST001\tATCGATCGATCG\tCGATCGATCGAT\t200\tTest STS\n"
+        stream = io.StringIO(content)
+
+        success = engine.load_sts_file(stream)
+
+        assert success
+        for bucket in engine.sts_table.values():
+            assert isinstance(bucket, tuple)
+        bucketed = [sts for bucket in engine.sts_table.values() for sts in bucket]
+        assert sorted(map(id, bucketed)) == sorted(map(id, engine.sts_records))
+
+    def test_hash_keys_match_hash_value(self, engine):
+        """Test table keys derived from packed codes agree with hash_value."""
+        content = (
+            "TEST001\tATCGATCGATCGTT\tCGATCGATCGAT\t200\tPacked\n"
+            "TEST002\tNATCGATCGATCG\tCGATCGAUCGATCG\t200\tAmbiguous\n"
+        )
+        stream = io.StringIO(content)
+
+        success = engine.load_sts_file(stream)
+
+        assert success
+        for key, bucket in engine.sts_table.items():
+            for sts in bucket:
+                assert hash_value(sts.primer1, engine.wordsize) == (sts.hash_offset, key)
+
+    def test_parallel_loading_matches_serial(self):
+        """Test multi-process loading produces the same records as serial loading."""
+        content = "".join(
+            f"TEST{i:03d}\tATCGATCGATC{'ACGT'[i % 4]}\tCGATCGATCGA{'ACGN'[i % 4]}\t{150 + i}\tSTS {i}\n"
+            for i in range(50)
+        )
+        stream = io.StringIO(content)
+
+        serial = STSLoader(11, 50, 240).load_stream(stream)
+        with (
+            patch("merpcr.io.sts.MIN_FILESIZE_FOR_THREADING", 0),
+            patch("merpcr.io.sts.PARALLEL_BATCH_SIZE", 7),
+        ):
+            parallel = STSLoader(11, 50, 240, threads=2).load_stream(io.StringIO(content))
+
+        assert parallel == serial
+
+    def test_parallel_creation_reads_input_lazily(self):
+        """Test the parallel path keeps at most two batches per worker in flight."""
+        consumed = 0
+
+        def valid_records():
+            nonlocal consumed
+            for i in range(100):
+                consumed += 1
+                yield f"TEST{i:03d}", "ATCGATCGATCG", "CGATCGATCGAT", 200, "", i + 1
+
+        loader = STSLoader(11, 50, 240, threads=2)
+        with patch("merpcr.io.sts.PARALLEL_BATCH_SIZE", 5):
+            created = loader._iter_created_parallel(valid_records(), Counter())
+            next(created)
+            # Four batches of five were submitted before the first result was used
+            assert consumed == 20
+            assert len(list(created)) == 99
+
+        assert consumed == 100
+
+    def test_comments_and_blank_lines(self, engine):
         """Test handling of comments and blank lines."""
         content = """# This is a comment
 TEST001\tATCGATCGATCG\tCGATCGATCGAT\t200\tTest STS
@@ -229,14 +312,14 @@ TEST001\tATCGATCGATCG\tCGATCGATCGAT\t200\tTest STS
 # Another comment
 TEST002\tGGCCTTAAGGCC\tGGCCTTAAGGCC\t180\tAnother STS
 """
-        temp_file = self.create_temp_sts(content)
+        stream = io.StringIO(content)
 
-        success = self.mer_pcr.load_sts_file(temp_file)
+        success = engine.load_sts_file(stream)
 
-        self.assertTrue(success)
+        assert success
         # Should have 4 records (2 STSs × 2 directions)
-        self.assertEqual(len(self.mer_pcr.sts_records), 4)
+        assert len(engine.sts_records) == 4
 
 
 if __name__ == "__main__":
-    unittest.main()
+    pytest.main([__file__])
@@ -4,9 +4,11 @@ Tests for module entry points and CLI integration.
 
 import logging
 import os
+import runpy
 import subprocess
 import sys
-import tempfile
+from dataclasses import dataclass
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
@@ -14,50 +16,99 @@ import pytest
 from merpcr.cli import main, setup_logging
 
 
+@pytest.fixture(scope="module")
+def minimal_inputs(tmp_path_factory):
+    """Directory holding the tiny STS and FASTA inputs shared by the CLI tests."""
+    base = tmp_path_factory.mktemp("cli_inputs")
+    (base / "test.sts").write_text("TEST\tATCG\tCGAT\t50\n")
+    (base / "test.fa").write_text(">test\nATCGCGAT\n")
+    return base
+
+
+@pytest.fixture(scope="module")
+def minimal_sts_path(minimal_inputs):
+    """Path of a one-line STS file, written once per module."""
+    return str(minimal_inputs / "test.sts")
+
+
+@pytest.fixture(scope="module")
+def minimal_fasta_path(minimal_inputs):
+    """Path of a one-record FASTA file, written once per module."""
+    return str(minimal_inputs / "test.fa")
+
+
+class FailingMerPCR:
+    """Stand-in for ``MerPCR`` whose constructor always fails."""
+
+    def __init__(self, *args, **kwargs):
+        raise RuntimeError("Test error")
+
+
+@dataclass
+class CLIFiles:
+    """Input and output paths for one CLI run."""
+
+    sts: Path
+    fa: Path
+    out: Path
+
+
+@pytest.fixture
+def cli_tmpfiles(tmp_path):
+    """Return a function writing the given STS and FASTA inputs under ``tmp_path``."""
+
+    def write(sts_content, fasta_content):
+        files = CLIFiles(tmp_path / "test.sts", tmp_path / "test.fa", tmp_path / "search.out")
+        files.sts.write_text(sts_content)
+        files.fa.write_text(fasta_content)
+        return files
+
+    return write
+
+
+@pytest.fixture
+def run_cli(monkeypatch):
+    """Return a function running ``main()`` with the given argv and returning its exit code."""
+
+    def run(argv):
+        monkeypatch.setattr(sys, "argv", argv)
+        return main()
+
+    return run
+
+
 class TestModuleEntryPoint:
-    """Test module entry points."""
+    """Test module entry points.
+
+    ``python -m merpcr`` is run in-process through runpy; only the version
+    smoke test starts a separate interpreter.
+    """
 
-    def test_python_module_execution(self):
+    def test_python_module_execution(self, tmp_path):
         """Test that python -m merpcr works correctly."""
-        # Create minimal test files
-        sts_content = "TEST\tAAAA\tTTTT\t50\n"
-        fasta_content = ">test\nAAAATTTT\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            # Test module execution
-            result = subprocess.run(
-                [sys.executable, "-m", "merpcr", sts_path, fasta_path, "-W", "4"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-
-            # Should complete without error (exit code 0 expected for successful run)
-            assert result.returncode == 0
-
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
-
-    def test_module_help(self):
+        sts_path = tmp_path / "test.sts"
+        sts_path.write_text("TEST\tAAAA\tTTTT\t50\n")
+        fasta_path = tmp_path / "test.fa"
+        fasta_path.write_text(">test\nAAAATTTT\n")
+
+        with patch("sys.argv", ["merpcr", str(sts_path), str(fasta_path), "-W", "4"]):
+            with pytest.raises(SystemExit) as exc_info:
+                runpy.run_module("merpcr", run_name="__main__")
+
+        # Should complete without error (exit code 0 expected for successful run)
+        assert exc_info.value.code == 0
+
+    def test_module_help(self, capsys):
         """Test module help output."""
-        result = subprocess.run(
-            [sys.executable, "-m", "merpcr", "--help"], capture_output=True, text=True, timeout=10
-        )
+        with patch("sys.argv", ["merpcr", "--help"]):
+            with pytest.raises(SystemExit) as exc_info:
+                runpy.run_module("merpcr", run_name="__main__")
 
-        assert result.returncode == 0
-        assert "merPCR - Modern Electronic Rapid PCR" in result.stdout
+        assert exc_info.value.code == 0
+        assert "merPCR - Modern Electronic Rapid PCR" in capsys.readouterr().out
 
     def test_module_version(self):
-        """Test module version output."""
+        """Smoke test the installed entry point in a fresh interpreter."""
         result = subprocess.run(
             [sys.executable, "-m", "merpcr", "--version"],
             capture_output=True,
@@ -72,247 +123,129 @@ class TestModuleEntryPoint:
 class TestCLIMainFunction:
     """Test CLI main() function comprehensively."""
 
-    def test_main_successful_execution(self):
+    def test_main_successful_execution(self, run_cli, minimal_sts_path, minimal_fasta_path):
         """Test successful main() execution."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
-        fasta_content = ">test\nATCGCGAT\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            with patch("sys.argv", ["merpcr", sts_path, fasta_path, "-W", "4"]):
-                result = main()
-                assert result == 0  # Success
+        assert run_cli(["merpcr", minimal_sts_path, minimal_fasta_path, "-W", "4"]) == 0
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
-
-    def test_main_sts_file_load_failure(self):
+    def test_main_sts_file_load_failure(self, run_cli, minimal_fasta_path):
         """Test main() when STS file loading fails."""
-        fasta_content = ">test\nATCGCGAT\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            # Use nonexistent STS file
-            with patch("sys.argv", ["merpcr", "/nonexistent.sts", fasta_path, "-W", "4"]):
-                result = main()
-                assert result == 1  # Failure
-
-        finally:
-            os.unlink(fasta_path)
+        # Use nonexistent STS file
+        assert run_cli(["merpcr", "/nonexistent.sts", minimal_fasta_path, "-W", "4"]) == 1
 
-    def test_main_fasta_file_load_failure(self):
+    def test_main_fasta_file_load_failure(self, run_cli, minimal_sts_path):
         """Test main() when FASTA file loading fails."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
+        # Use nonexistent FASTA file
+        assert run_cli(["merpcr", minimal_sts_path, "/nonexistent.fa", "-W", "4"]) == 1
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        try:
-            # Use nonexistent FASTA file
-            with patch("sys.argv", ["merpcr", sts_path, "/nonexistent.fa", "-W", "4"]):
-                result = main()
-                assert result == 1  # Failure
-
-        finally:
-            os.unlink(sts_path)
-
-    def test_main_empty_fasta_file(self):
+    def test_main_empty_fasta_file(self, run_cli, minimal_sts_path, tmp_path):
         """Test main() with empty FASTA file."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            # Empty FASTA file
-            fasta_path = fasta_f.name
+        fasta_path = tmp_path / "empty.fa"
+        fasta_path.write_text("")
 
-        try:
-            with patch("sys.argv", ["merpcr", sts_path, fasta_path, "-W", "4"]):
-                result = main()
-                assert result == 1  # Should fail due to empty FASTA
+        # Should fail due to empty FASTA
+        assert run_cli(["merpcr", minimal_sts_path, str(fasta_path), "-W", "4"]) == 1
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
-
-    def test_main_exception_handling(self):
+    def test_main_exception_handling(self, run_cli, monkeypatch, caplog):
         """Test main() exception handling."""
-        with patch("sys.argv", ["merpcr", "test.sts", "test.fa"]):
-            with patch("merpcr.cli.MerPCR") as mock_merpcr:
-                # Make MerPCR initialization raise an exception
-                mock_merpcr.side_effect = RuntimeError("Test error")
+        # Make MerPCR initialization raise an exception. main() builds the engine
+        # before touching the input files, so these names never need to exist.
+        monkeypatch.setattr("merpcr.cli.MerPCR", FailingMerPCR)
 
-                result = main()
-                assert result == 1  # Should handle exception and return 1
+        # Should handle exception and return 1
+        assert run_cli(["merpcr", "test.sts", "test.fa"]) == 1
+        assert "Error: Test error" in caplog.text
 
-    def test_main_exception_with_debug(self):
+    def test_main_exception_with_debug(self, run_cli, monkeypatch, caplog):
         """Test main() exception handling with debug mode."""
-        with patch("sys.argv", ["merpcr", "test.sts", "test.fa", "--debug"]):
-            with patch("merpcr.cli.MerPCR") as mock_merpcr:
-                mock_merpcr.side_effect = RuntimeError("Test error")
+        monkeypatch.setattr("merpcr.cli.MerPCR", FailingMerPCR)
+        mock_traceback = Mock()
+        monkeypatch.setattr("traceback.print_exc", mock_traceback)
 
-                with patch("traceback.print_exc") as mock_traceback:
-                    result = main()
-                    assert result == 1
-                    mock_traceback.assert_called_once()  # Debug mode should print traceback
+        assert run_cli(["merpcr", "test.sts", "test.fa", "--debug"]) == 1
+        assert "Error: Test error" in caplog.text
+        mock_traceback.assert_called_once()  # Debug mode should print traceback
 
-    def test_main_with_mepcr_arguments(self):
+    def test_main_with_mepcr_arguments(self, run_cli, minimal_sts_path, minimal_fasta_path):
         """Test main() with me-PCR style arguments."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
-        fasta_content = ">test\nATCGCGAT\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            # Use me-PCR style arguments
-            with patch("sys.argv", ["merpcr", sts_path, fasta_path, "W=4", "M=100"]):
-                result = main()
-                assert result == 0  # Should succeed with argument conversion
+        # Should succeed with argument conversion
+        assert run_cli(["merpcr", minimal_sts_path, minimal_fasta_path, "W=4", "M=100"]) == 0
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
-
-    def test_main_with_output_file(self):
+    def test_main_with_output_file(self, run_cli, minimal_sts_path, minimal_fasta_path, tmp_path):
         """Test main() with output file specified."""
-        sts_content = "TEST\tATCG\tCGAT\t50\n"
-        fasta_content = ">test\nATCGCGAT\n"
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".out", delete=False) as out_f:
-            out_path = out_f.name
-
-        try:
-            with patch("sys.argv", ["merpcr", sts_path, fasta_path, "-W", "4", "-O", out_path]):
-                result = main()
-                assert result == 0
+        out_path = str(tmp_path / "search.out")
 
-                # Check that output file was created
-                assert os.path.exists(out_path)
+        argv = ["merpcr", minimal_sts_path, minimal_fasta_path, "-W", "4", "-O", out_path]
+        assert run_cli(argv) == 0
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
-            if os.path.exists(out_path):
-                os.unlink(out_path)
+        # Check that output file was created
+        assert os.path.exists(out_path)
 
 
 class TestLoggingSetup:
     """Test logging setup comprehensively."""
 
-    def test_setup_logging_debug_mode(self):
-        """Test logging setup with debug mode."""
-        # Clear any existing handlers
+    @pytest.fixture(autouse=True)
+    def restore_logger(self):
+        """Restore the merpcr logger's handlers and level after each test."""
         logger = logging.getLogger("merpcr")
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
-
-        setup_logging(quiet=0, debug=True)
-
-        logger = logging.getLogger("merpcr")
-        assert logger.level == logging.DEBUG
-
-    def test_setup_logging_verbose_mode(self):
-        """Test logging setup with verbose mode (quiet=0)."""
+        handlers, level = logger.handlers[:], logger.level
+        yield
+        logger.handlers[:] = handlers
+        logger.setLevel(level)
+
+    @pytest.mark.parametrize(
+        "quiet,debug,expected",
+        [
+            (0, True, logging.DEBUG),
+            (0, False, logging.INFO),
+            (1, False, logging.WARNING),
+            (1, True, logging.DEBUG),  # Debug should override quiet
+        ],
+        ids=["debug", "verbose", "quiet", "debug_overrides_quiet"],
+    )
+    def test_setup_logging_level(self, quiet, debug, expected):
+        """Test the merpcr logger level chosen for each quiet/debug combination."""
+        setup_logging(quiet=quiet, debug=debug)
+
+        assert logging.getLogger("merpcr").level == expected
+
+    def test_setup_logging_adds_no_merpcr_handlers(self):
+        """Test repeated setup does not attach handlers to the merpcr logger."""
         logger = logging.getLogger("merpcr")
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
+        before = len(logger.handlers)
 
+        setup_logging(quiet=0, debug=False)
         setup_logging(quiet=0, debug=False)
 
-        logger = logging.getLogger("merpcr")
-        assert logger.level == logging.INFO
-
-    def test_setup_logging_quiet_mode(self):
-        """Test logging setup with quiet mode (quiet=1)."""
-        logger = logging.getLogger("merpcr")
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
-
-        setup_logging(quiet=1, debug=False)
-
-        logger = logging.getLogger("merpcr")
-        assert logger.level == logging.WARNING
-
-    def test_setup_logging_debug_overrides_quiet(self):
-        """Test that debug mode overrides quiet setting."""
-        logger = logging.getLogger("merpcr")
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
-
-        setup_logging(quiet=1, debug=True)
-
-        logger = logging.getLogger("merpcr")
-        assert logger.level == logging.DEBUG  # Debug should override quiet
+        assert len(logger.handlers) == before
 
 
 class TestCLIErrorPaths:
     """Test CLI error paths and edge cases."""
 
-    def test_invalid_arguments(self):
-        """Test CLI with invalid arguments."""
-        with patch("sys.argv", ["merpcr", "--invalid-arg"]):
-            with pytest.raises(SystemExit):
-                main()
-
-    def test_missing_required_arguments(self):
-        """Test CLI with missing required arguments."""
-        with patch("sys.argv", ["merpcr"]):
-            with pytest.raises(SystemExit):
-                main()
-
-    def test_invalid_parameter_values(self):
-        """Test CLI with invalid parameter values."""
-        with patch("sys.argv", ["merpcr", "test.sts", "test.fa", "-W", "100"]):  # Invalid wordsize
-            with pytest.raises(SystemExit):
-                main()
-
-    def test_help_argument(self):
-        """Test CLI help argument."""
-        with patch("sys.argv", ["merpcr", "--help"]):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
-            assert exc_info.value.code == 0  # Help should exit with 0
-
-    def test_version_argument(self):
-        """Test CLI version argument."""
-        with patch("sys.argv", ["merpcr", "--version"]):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
-            assert exc_info.value.code == 0  # Version should exit with 0
+    @pytest.mark.parametrize(
+        "argv,exit_code",
+        [
+            (["merpcr", "--invalid-arg"], None),
+            (["merpcr"], None),  # Missing required arguments
+            (["merpcr", "test.sts", "test.fa", "-W", "100"], None),  # Invalid wordsize
+            (["merpcr", "--help"], 0),
+            (["merpcr", "--version"], 0),
+        ],
+        ids=["invalid_argument", "missing_arguments", "invalid_value", "help", "version"],
+    )
+    def test_cli_exits(self, run_cli, argv, exit_code):
+        """Test argument handling that exits before any search runs."""
+        with pytest.raises(SystemExit) as exc_info:
+            run_cli(argv)
+        if exit_code is not None:
+            assert exc_info.value.code == exit_code
 
 
 class TestCLIIntegrationComplex:
     """Complex integration tests for CLI functionality."""
 
-    def test_complex_sts_file(self):
+    def test_complex_sts_file(self, run_cli, cli_tmpfiles):
         """Test with complex STS file containing various edge cases."""
         complex_sts = """# This is a comment
 AFM256vb9	TCTGAATGGCCCTTGG	TCCTATCTGAGGTGGGGT	180	(D17S934)  Chr.17, 63.7 cM
@@ -325,75 +258,45 @@ RANGE_TEST\tATCGATCG\tGCTAGCTA\t100-150\tRange test
 
         fasta_content = ">test_seq\n" + "ATCG" * 1000 + "\n"  # Long sequence
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(complex_sts)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        try:
-            with patch("sys.argv", ["merpcr", sts_path, fasta_path, "-W", "8", "-M", "200"]):
-                result = main()
-                # Should succeed even with complex data
-                assert result == 0
+        files = cli_tmpfiles(complex_sts, fasta_content)
 
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        # Should succeed even with complex data
+        assert run_cli(["merpcr", str(files.sts), str(files.fa), "-W", "8", "-M", "200"]) == 0
 
-    def test_all_parameters_integration(self):
+    def test_all_parameters_integration(self, run_cli, cli_tmpfiles):
         """Test integration with all possible parameters."""
         sts_content = "TEST\tATCGATCGATCG\tGCTAGCTAGCTA\t100\n"
         fasta_content = ">test\nATCGATCGATCGGCTAGCTAGCTA\n"
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write(sts_content)
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".out", delete=False) as out_f:
-            out_path = out_f.name
-
-        try:
-            # Test with all parameters
-            argv = [
-                "merpcr",
-                sts_path,
-                fasta_path,
-                "-M",
-                "50",
-                "-N",
-                "1",
-                "-W",
-                "8",
-                "-T",
-                "2",
-                "-X",
-                "1",
-                "-Z",
-                "240",
-                "-I",
-                "1",
-                "-S",
-                "1024",
-                "-O",
-                out_path,
-                "-Q",
-                "0",
-                "--debug",
-            ]
-
-            with patch("sys.argv", argv):
-                result = main()
-                assert result == 0
-
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
-            if os.path.exists(out_path):
-                os.unlink(out_path)
+        files = cli_tmpfiles(sts_content, fasta_content)
+
+        # Test with all parameters
+        argv = [
+            "merpcr",
+            str(files.sts),
+            str(files.fa),
+            "-M",
+            "50",
+            "-N",
+            "1",
+            "-W",
+            "8",
+            "-T",
+            "2",
+            "-X",
+            "1",
+            "-Z",
+            "240",
+            "-I",
+            "1",
+            "-S",
+            "1024",
+            "-O",
+            str(files.out),
+            "-Q",
+            "0",
+            "--debug",
+        ]
+
+        assert run_cli(argv) == 0
+        assert files.out.exists()
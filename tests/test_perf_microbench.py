@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the engine's hot helpers and its load and search paths.
+
+These guard ``_hash_value``, ``_compare_seqs`` and ``_reverse_complement``,
+STS loading and a 100 kb search against silent slowdowns. Save a baseline
+and compare later runs with::
+
+    pytest tests/test_perf_microbench.py --benchmark-autosave
+    pytest tests/test_perf_microbench.py --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+
+import io
+import os
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from merpcr import MerPCR
+from merpcr.core.models import FASTARecord
+
+pytestmark = [pytest.mark.performance, pytest.mark.benchmark(group="hotpath")]
+
+SEQUENCE_LENGTH = 100000
+STS_COUNT = 1000
+
+
+@pytest.fixture(scope="module")
+def sequence():
+    """A reproducible 100 kb random sequence."""
+    rng = random.Random(20240101)
+    return "".join(rng.choices("ACGT", k=SEQUENCE_LENGTH))
+
+
+@pytest.fixture(scope="module")
+def sts_text():
+    """A reproducible STS file of 1000 random 20-base primer pairs."""
+    rng = random.Random(20240102)
+    return "".join(
+        f"STS_{i:04d}\t{''.join(rng.choices('ACGT', k=20))}\t"
+        f"{''.join(rng.choices('ACGT', k=20))}\t{rng.randint(100, 500)}\n"
+        for i in range(STS_COUNT)
+    )
+
+
+@pytest.fixture(scope="module")
+def amplicon_engine(sequence):
+    """Single-threaded engine with a 200 bp amplicon every kilobase of the sequence."""
+    sts_text = "".join(
+        f"AMP{pos}\t{sequence[pos:pos + 20]}\t{sequence[pos + 180:pos + 200]}\t200\n"
+        for pos in range(0, SEQUENCE_LENGTH - 200, 1000)
+    )
+    engine = MerPCR(threads=1)
+    assert engine.load_sts_file(io.StringIO(sts_text))
+    return engine
+
+
+@pytest.fixture(scope="module")
+def engine8():
+    """Engine with an 8-base word for the hash benchmark."""
+    return MerPCR(wordsize=8)
+
+
+@pytest.fixture(scope="module")
+def engine_cmp():
+    """Engine allowing one mismatch outside a two-base 3' region."""
+    return MerPCR(mismatches=1, three_prime_match=2)
+
+
+def test_bench_hash_value(benchmark, engine8, sequence):
+    """Hash every non-overlapping 8-base word of the sequence."""
+    words = [sequence[i : i + 8] for i in range(0, len(sequence) - 8, 8)]
+    hashes = benchmark(lambda: [engine8._hash_value(word) for word in words])
+    assert all(offset == 0 for offset, _ in hashes)
+
+
+def test_bench_compare_seqs(benchmark, engine_cmp, sequence):
+    """Compare 10 000 primer-length windows against a fixed primer."""
+    primer = sequence[:20]
+    windows = [sequence[i : i + 20] for i in range(0, 90000, 9)]
+    matches = benchmark(lambda: [engine_cmp._compare_seqs(w, primer, "+") for w in windows])
+    assert matches[0] is True
+
+
+def test_bench_reverse_complement(benchmark, engine_cmp, sequence):
+    """Reverse complement the whole 100 kb sequence."""
+    result = benchmark(engine_cmp._reverse_complement, sequence)
+    assert len(result) == len(sequence)
+
+
+@pytest.mark.benchmark(group="engine")
+def test_bench_load_sts(benchmark, sts_text):
+    """Parse and index 1000 STSs."""
+    engine = MerPCR(threads=1)
+    loaded = benchmark(lambda: engine.load_sts_file(io.StringIO(sts_text)))
+    assert loaded
+    assert len(engine.sts_records) == 2 * STS_COUNT
+
+
+@pytest.mark.benchmark(group="engine")
+def test_bench_search(benchmark, amplicon_engine, sequence):
+    """Search the 100 kb sequence for its planted amplicons."""
+    records = [FASTARecord(defline=">bench", sequence=sequence)]
+    hits = benchmark(amplicon_engine.search, records, os.devnull)
+    assert hits == SEQUENCE_LENGTH // 1000
@@ -3,274 +3,235 @@
 Performance and benchmarking tests for merPCR.
 """
 
+import functools
 import os
-import sys
-import tempfile
 import time
-import unittest
+import tracemalloc
 from pathlib import Path
 
 import pytest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
 from merpcr import MerPCR
 from merpcr.core.models import FASTARecord
 
+# Smaller inputs keep the suite fast on CI runners
+IN_CI = bool(os.getenv("CI") or os.getenv("GITHUB_ACTIONS"))
 
-@pytest.mark.performance
-class TestPerformance(unittest.TestCase):
-    """Performance benchmarking tests."""
-
-    def setUp(self):
-        """Set up performance test environment."""
-        self.mer_pcr = MerPCR(threads=1)  # Single thread for consistent timing
-
-    def create_large_sequence(self, length=100000, pattern="ATCGATCG"):
-        """Create a large test sequence."""
-        repeats = length // len(pattern)
-        remainder = length % len(pattern)
-        return pattern * repeats + pattern[:remainder]
-
-    def create_test_sts(self, num_sts=100):
-        """Create multiple test STSs."""
-        sts_content = []
-        for i in range(num_sts):
-            sts_id = f"STS_{i:03d}"
-            primer1 = "ATCGATCGATCG"
-            primer2 = "CGATCGATCGAT"
-            pcr_size = 200 + i  # Vary the PCR size
-            alias = f"Test STS {i}"
-            sts_content.append(f"{sts_id}\t{primer1}\t{primer2}\t{pcr_size}\t{alias}")
-
-        return "\n".join(sts_content) + "\n"
-
-    @unittest.skipIf(os.getenv("SKIP_PERFORMANCE_TESTS"), "Performance tests skipped")
-    def test_large_sequence_processing(self):
-        """Test processing of large sequences."""
-        # Create a smaller sequence for CI/testing
-        seq_size = 1000 if os.getenv("CI") or os.getenv("GITHUB_ACTIONS") else 100000
-        large_seq = self.create_large_sequence(seq_size)
-        fasta_record = FASTARecord(defline=">large_sequence", sequence=large_seq)
+# Worker threads for the multi-threaded engine, bounded by the available cores
+THREADS = min(4, os.cpu_count() or 1)
 
-        # Create test STS data that will actually match the repeating pattern
-        sts_content = "TEST001\tATCGATCG\tATCGATCG\t50\tTest STS\n"  # Simple matching STS
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(sts_content)
-            sts_file = f.name
+# An STS that matches the repeating ATCGATCG test sequence
+SIMPLE_STS = "TEST001\tATCGATCG\tATCGATCG\t50\tTest STS\n"
 
-        try:
-            # Time STS loading
-            start_time = time.time()
-            success = self.mer_pcr.load_sts_file(sts_file)
-            sts_load_time = time.time() - start_time
-
-            self.assertTrue(success)
-            self.assertLess(sts_load_time, 1.0, "STS loading should be under 1 second")
-
-            # Time sequence processing
-            start_time = time.time()
-            hit_count = self.mer_pcr.search([fasta_record])
-            search_time = time.time() - start_time
-
-            expected_time = 2.0 if os.getenv("CI") or os.getenv("GITHUB_ACTIONS") else 5.0
-            self.assertLess(
-                search_time,
-                expected_time,
-                f"Search should complete under {expected_time} seconds for {seq_size} bp",
-            )
-            print(f"Large sequence search took {search_time:.3f} seconds for {seq_size} bp")
 
-        finally:
-            os.unlink(sts_file)
+@functools.cache
+def create_large_sequence(length=100000, pattern="ATCGATCG"):
+    """Create a large test sequence, built once per session for each size."""
+    repeats = length // len(pattern)
+    remainder = length % len(pattern)
+    return pattern * repeats + pattern[:remainder]
 
-    @unittest.skipIf(os.getenv("SKIP_PERFORMANCE_TESTS"), "Performance tests skipped")
-    def test_many_sts_loading(self):
-        """Test loading many STS records."""
-        # Create fewer STS records for CI
-        sts_count = 100 if os.getenv("CI") or os.getenv("GITHUB_ACTIONS") else 1000
-        sts_content = self.create_test_sts(sts_count)
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(sts_content)
-            sts_file = f.name
+def create_test_sts(num_sts=100):
+    """Create multiple test STSs."""
+    primer1 = "ATCGATCGATCG"
+    primer2 = "CGATCGATCGAT"
+    return "".join(
+        f"STS_{i:03d}\t{primer1}\t{primer2}\t{200 + i}\tTest STS {i}\n" for i in range(num_sts)
+    )
 
-        try:
-            start_time = time.time()
-            success = self.mer_pcr.load_sts_file(sts_file)
-            load_time = time.time() - start_time
-
-            self.assertTrue(success)
-            expected_records = sts_count * 2  # Each STS creates 2 records (forward and reverse)
-            self.assertEqual(len(self.mer_pcr.sts_records), expected_records)
-            expected_load_time = 1.0 if os.getenv("CI") or os.getenv("GITHUB_ACTIONS") else 2.0
-            self.assertLess(
-                load_time,
-                expected_load_time,
-                f"Loading {sts_count} STSs should be under {expected_load_time} seconds",
-            )
-            print(f"Loading {sts_count} STSs took {load_time:.3f} seconds")
 
-        finally:
-            os.unlink(sts_file)
+@pytest.fixture(scope="session")
+def sts_1000_path(tmp_path_factory):
+    """Path of a 1000-STS file, generated once per session."""
+    sts_path = tmp_path_factory.mktemp("perf") / "sts_1000.sts"
+    sts_path.write_text(create_test_sts(1000))
+    return sts_path
 
-    def test_threading_performance(self):
-        """Test that threading improves performance on large sequences."""
-        # Create a large sequence to ensure threading is used
-        seq_size = (
-            1000 if os.getenv("CI") or os.getenv("GITHUB_ACTIONS") else 500000
-        )  # 1KB vs 500KB
-        large_seq = self.create_large_sequence(seq_size)
-        fasta_record = FASTARecord(defline=">large_sequence", sequence=large_seq)
 
-        # Create simple test STS data
-        sts_content = "TEST001\tATCGATCG\tATCGATCG\t50\tTest STS\n"
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(sts_content)
-            sts_file = f.name
+@pytest.fixture(scope="class")
+def simple_sts_path(tmp_path_factory):
+    """Path of the simple matching STS file, written once per class."""
+    sts_path = tmp_path_factory.mktemp("perf") / "simple.sts"
+    sts_path.write_text(SIMPLE_STS)
+    return sts_path
 
-        try:
-            # Test single-threaded
-            mer_pcr_single = MerPCR(threads=1)
-            mer_pcr_single.load_sts_file(sts_file)
 
-            start_time = time.time()
-            hits_single = mer_pcr_single.search([fasta_record])
-            time_single = time.time() - start_time
+@pytest.fixture(scope="class")
+def loaded_merpcr_single(simple_sts_path):
+    """Single-threaded MerPCR with the simple STS loaded, shared within a class."""
+    mer_pcr = MerPCR(threads=1)  # Single thread for consistent timing
+    assert mer_pcr.load_sts_file(simple_sts_path)
+    return mer_pcr
 
-            # Test multi-threaded
-            mer_pcr_multi = MerPCR(threads=4)
-            mer_pcr_multi.load_sts_file(sts_file)
 
-            start_time = time.time()
-            hits_multi = mer_pcr_multi.search([fasta_record])
-            time_multi = time.time() - start_time
+@pytest.fixture(scope="class")
+def loaded_merpcr_multi(simple_sts_path):
+    """Multi-threaded MerPCR with the simple STS loaded, shared within a class."""
+    mer_pcr = MerPCR(threads=THREADS)
+    assert mer_pcr.load_sts_file(simple_sts_path)
+    return mer_pcr
 
-            # Results should be identical
-            self.assertEqual(hits_single, hits_multi)
 
-            print(f"Single-threaded: {time_single:.3f}s, Multi-threaded: {time_multi:.3f}s")
+@pytest.mark.performance
+class TestPerformance:
+    """Performance benchmarking tests.
 
-            # Multi-threaded should be faster (or at least not significantly slower)
-            # Allow some variance due to overhead
-            self.assertLessEqual(
-                time_multi, time_single * 1.5, "Multi-threading should not be significantly slower"
-            )
+    Searching does not change an engine, so the loaded engines are shared
+    between the tests of the class.
+    """
 
-        finally:
-            os.unlink(sts_file)
+    def test_large_sequence_processing(self, loaded_merpcr_single):
+        """Test processing of large sequences."""
+        # Create a smaller sequence for CI/testing
+        seq_size = 1000 if IN_CI else 100000
+        large_seq = create_large_sequence(seq_size)
+        fasta_record = FASTARecord(defline=">large_sequence", sequence=large_seq)
 
-    def test_memory_efficiency(self):
-        """Test memory efficiency with large datasets."""
-        import os
+        # Timing regressions are tracked by test_bench_search in test_perf_microbench.py
+        start_time = time.perf_counter()
+        hit_count = loaded_merpcr_single.search([fasta_record], output_file=os.devnull)
+        search_time = time.perf_counter() - start_time
 
-        import psutil
+        assert hit_count >= 0
+        print(f"Large sequence search took {search_time:.3f} seconds for {seq_size} bp")
 
-        # Get initial memory usage
-        process = psutil.Process(os.getpid())
-        initial_memory = process.memory_info().rss / 1024 / 1024  # MB
+    def test_many_sts_loading(self, sts_1000_path):
+        """Test loading many STS records."""
+        # Loading 1000 STSs takes milliseconds, so CI uses the full set too
+        sts_count = 1000
+
+        # Timing regressions are tracked by test_bench_load_sts in test_perf_microbench.py
+        mer_pcr = MerPCR(threads=1)
+        start_time = time.perf_counter()
+        success = mer_pcr.load_sts_file(sts_1000_path)
+        load_time = time.perf_counter() - start_time
+
+        assert success
+        expected_records = sts_count * 2  # Each STS creates 2 records (forward and reverse)
+        assert len(mer_pcr.sts_records) == expected_records
+        print(f"Loading {sts_count} STSs took {load_time:.3f} seconds")
+
+    @pytest.mark.skipif(THREADS < 2, reason="Threading needs at least two CPU cores")
+    def test_threading_performance(self, loaded_merpcr_single, loaded_merpcr_multi):
+        """Test that threading improves performance on large sequences."""
+        # Give each thread enough work to outweigh the thread startup cost
+        seq_size = 1000 if IN_CI else max(500000, 200000 * THREADS)
+        large_seq = create_large_sequence(seq_size)
+        fasta_record = FASTARecord(defline=">large_sequence", sequence=large_seq)
 
+        # Test single-threaded
+        start_time = time.perf_counter()
+        hits_single = loaded_merpcr_single.search([fasta_record])
+        time_single = time.perf_counter() - start_time
+
+        # Test multi-threaded
+        start_time = time.perf_counter()
+        hits_multi = loaded_merpcr_multi.search([fasta_record])
+        time_multi = time.perf_counter() - start_time
+
+        # Results should be identical
+        assert hits_single == hits_multi
+
+        print(f"Single-threaded: {time_single:.3f}s, Multi-threaded: {time_multi:.3f}s")
+
+        # Multi-threaded should be faster (or at least not significantly slower)
+        # Allow some variance due to overhead
+        assert time_multi <= time_single * 1.5, "Multi-threading should not be significantly slower"
+
+    @pytest.mark.slow
+    def test_memory_efficiency(self, simple_sts_path, sts_1000_path):
+        """Test memory efficiency with large datasets."""
         # Create test data - smaller for CI
-        seq_size = 1000 if os.getenv("CI") or os.getenv("GITHUB_ACTIONS") else 1000000  # 1KB vs 1MB
-        large_seq = self.create_large_sequence(seq_size)
+        seq_size = 1000 if IN_CI else 1000000  # 1KB vs 1MB
+        large_seq = create_large_sequence(seq_size)
         fasta_record = FASTARecord(defline=">large_sequence", sequence=large_seq)
 
         # Use simple STS for CI to avoid too many matches
-        sts_content = (
-            "TEST001\tATCGATCG\tATCGATCG\t50\tTest STS\n"
-            if os.getenv("CI") or os.getenv("GITHUB_ACTIONS")
-            else self.create_test_sts(1000)
-        )
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(sts_content)
-            sts_file = f.name
+        sts_file = simple_sts_path if IN_CI else sts_1000_path
 
+        # Trace the peak of the allocations made by loading and searching alone; the
+        # process RSS high-water mark may already have been set by earlier tests
+        tracemalloc.start()
         try:
-            mer_pcr = MerPCR()
+            mer_pcr = MerPCR()  # Single-threaded, so every allocation is in this process
             mer_pcr.load_sts_file(sts_file)
 
             # Redirect output to prevent massive console output in CI
-            import os
+            mer_pcr.search([fasta_record], output_file=os.devnull)
 
-            with open(os.devnull, "w") as devnull:
-                mer_pcr.search([fasta_record], output_file=os.devnull)
+            memory_increase = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        finally:
+            tracemalloc.stop()
 
-            # Check memory usage after processing
-            final_memory = process.memory_info().rss / 1024 / 1024  # MB
-            memory_increase = final_memory - initial_memory
+        sts_count = 1 if IN_CI else 1000
+        print(
+            f"Memory usage increased by {memory_increase:.1f} MB for {seq_size} bp sequence with {sts_count} STSs"
+        )
 
-            sts_count = 1 if os.getenv("CI") or os.getenv("GITHUB_ACTIONS") else 1000
-            print(
-                f"Memory usage increased by {memory_increase:.1f} MB for {seq_size} bp sequence with {sts_count} STSs"
-            )
+        # Memory increase should be reasonable
+        expected_memory_limit = 100 if IN_CI else 500
+        assert (
+            memory_increase < expected_memory_limit
+        ), f"Memory usage increase should be under {expected_memory_limit} MB"
 
-            # Memory increase should be reasonable
-            expected_memory_limit = 100 if os.getenv("CI") or os.getenv("GITHUB_ACTIONS") else 500
-            self.assertLess(
-                memory_increase,
-                expected_memory_limit,
-                f"Memory usage increase should be under {expected_memory_limit} MB",
-            )
 
-        finally:
-            os.unlink(sts_file)
+# Non-matching STS for scalability tests, to avoid excessive output
+NON_MATCHING_STS = "TEST001\tGGGGGGGGGGGG\tCCCCCCCCCCCC\t200\tTest STS\n"
+
+SCALING_SIZES = [10000, 50000, 100000]  # 10KB, 50KB, 100KB
+
+# Search time per sequence size, filled in by test_sequence_length_scaling
+SCALING_TIMES = {}
+
+
+@pytest.fixture(scope="class")
+def scaling_merpcr(tmp_path_factory):
+    """Single-threaded MerPCR with the non-matching STS loaded, shared within a class."""
+    sts_path = tmp_path_factory.mktemp("scaling") / "nonmatching.sts"
+    sts_path.write_text(NON_MATCHING_STS)
+    mer_pcr = MerPCR(threads=1)
+    assert mer_pcr.load_sts_file(sts_path)
+    return mer_pcr
 
 
 @pytest.mark.performance
-class TestScalability(unittest.TestCase):
+class TestScalability:
     """Test scalability with increasing data sizes."""
 
-    def test_sequence_length_scaling(self):
-        """Test how performance scales with sequence length."""
-        sizes = [10000, 50000, 100000]  # 10KB, 50KB, 100KB
-        times = []
+    @pytest.mark.parametrize("size", SCALING_SIZES)
+    def test_sequence_length_scaling(self, scaling_merpcr, size):
+        """Time the search of one sequence size for the scaling check."""
+        sequence = create_large_sequence(size, "ATCG")
+        fasta_record = FASTARecord(defline=f">test_seq_{size}", sequence=sequence)
 
-        # Use non-matching STS for scalability test to avoid excessive output
-        sts_content = "TEST001\tGGGGGGGGGGGG\tCCCCCCCCCCCC\t200\tTest STS\n"
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as f:
-            f.write(sts_content)
-            sts_file = f.name
+        # Best of three runs, so a single scheduler hiccup does not skew the ratio
+        elapsed = float("inf")
+        for _ in range(3):
+            start_time = time.perf_counter()
+            # Redirect output to avoid console spam
+            scaling_merpcr.search([fasta_record], output_file=os.devnull)
+            elapsed = min(elapsed, time.perf_counter() - start_time)
+        SCALING_TIMES[size] = elapsed
 
-        try:
-            for size in sizes:
-                mer_pcr = MerPCR(threads=1)
-                mer_pcr.load_sts_file(sts_file)
-
-                # Create sequence of specified size
-                sequence = "ATCG" * (size // 4)
-                fasta_record = FASTARecord(defline=f">test_seq_{size}", sequence=sequence)
-
-                start_time = time.time()
-                # Redirect output to avoid console spam
-                import os
-
-                with open(os.devnull, "w") as devnull:
-                    mer_pcr.search([fasta_record], output_file=os.devnull)
-                elapsed = time.time() - start_time
-                times.append(elapsed)
-
-                print(f"Size: {size:6d} bp, Time: {elapsed:.3f}s")
-
-            # Check that time scaling is reasonable (should be roughly linear)
-            # Allow for some variance due to system factors
-            for i in range(1, len(times)):
-                ratio = sizes[i] / sizes[i - 1]
-                time_ratio = times[i] / times[i - 1]
-
-                # Time ratio should not be much worse than size ratio
-                self.assertLess(
-                    time_ratio,
-                    ratio * 2,
-                    f"Time scaling should be reasonable: {time_ratio:.2f}x vs {ratio:.2f}x size increase",
-                )
+        print(f"Size: {size:6d} bp, Time: {elapsed:.3f}s")
 
-        finally:
-            os.unlink(sts_file)
+    def test_time_scales_linearly(self):
+        """Test how performance scales with sequence length."""
+        if len(SCALING_TIMES) < len(SCALING_SIZES):
+            pytest.skip("Not every sequence size was timed in this run")
 
+        # Check that time scaling is reasonable (should be roughly linear)
+        # Allow for some variance due to system factors
+        for smaller, larger in zip(SCALING_SIZES, SCALING_SIZES[1:]):
+            ratio = larger / smaller
+            time_ratio = SCALING_TIMES[larger] / SCALING_TIMES[smaller]
 
-if __name__ == "__main__":
-    # Allow skipping performance tests with environment variable
-    if os.getenv("SKIP_PERFORMANCE_TESTS"):
-        print("Performance tests skipped due to SKIP_PERFORMANCE_TESTS environment variable")
+            # Time ratio should not be much worse than size ratio
+            assert (
+                time_ratio < ratio * 2
+            ), f"Time scaling should be reasonable: {time_ratio:.2f}x vs {ratio:.2f}x size increase"
 
-    unittest.main()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-m", "performance"])
@@ -4,10 +4,10 @@ Property-based tests for robustness and edge case discovery.
 These tests use generated data to find edge cases and ensure robustness.
 """
 
+import io
 import os
 import random
 import string
-import tempfile
 
 import pytest
 
@@ -25,6 +25,16 @@ try:
 except ImportError:
     HYPOTHESIS_AVAILABLE = False
 
+if HYPOTHESIS_AVAILABLE:
+    # Tests without their own max_examples draw 100 examples locally; CI sets
+    # HYPOTHESIS_PROFILE=ci for a smaller, reproducible run without the example database
+    settings.register_profile("dev", max_examples=100)
+    settings.register_profile("ci", max_examples=25, derandomize=True, database=None, deadline=None)
+    # pytest-xdist workers (see conftest.py) draw reproducible examples and keep
+    # no example database, so no two workers race on the same directory
+    settings.register_profile("xdist", derandomize=True, database=None, deadline=None)
+    settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "dev"))
+
 pytestmark = pytest.mark.skipif(not HYPOTHESIS_AVAILABLE, reason="hypothesis not available")
 
 
@@ -69,7 +79,6 @@ class TestPropertyBasedUtils:
     """Property-based tests for utility functions."""
 
     @given(dna_sequence())
-    @settings(max_examples=100)
     def test_reverse_complement_involution(self, sequence):
         """Test that reverse_complement(reverse_complement(x)) == x."""
         # Property: applying reverse complement twice should return original
@@ -77,14 +86,12 @@ class TestPropertyBasedUtils:
         assert result == sequence, f"Double reverse complement failed for: {sequence}"
 
     @given(dna_sequence())
-    @settings(max_examples=100)
     def test_reverse_complement_length_preservation(self, sequence):
         """Test that reverse complement preserves sequence length."""
         result = reverse_complement(sequence)
         assert len(result) == len(sequence)
 
     @given(dna_sequence())
-    @settings(max_examples=100)
     def test_reverse_complement_base_validity(self, sequence):
         """Test that reverse complement produces valid DNA bases."""
         result = reverse_complement(sequence)
@@ -113,17 +120,16 @@ class TestPropertyBasedUtils:
                 # Hash should fit in expected bit range
                 assert hash_val < (1 << (2 * wordsize))
 
-    @given(dna_sequence(), dna_sequence(), integers(min_value=3, max_value=16))
-    @settings(max_examples=50)
-    def test_hash_value_deterministic(self, seq1, seq2, wordsize):
+    @given(dna_sequence(), integers(min_value=3, max_value=16))
+    @settings(max_examples=20)
+    def test_hash_value_deterministic(self, sequence, wordsize):
         """Test that hash values are deterministic."""
-        if seq1 == seq2:
-            hash1 = hash_value(seq1, wordsize)
-            hash2 = hash_value(seq2, wordsize)
-            assert hash1 == hash2, "Same sequences should produce same hashes"
+        hash1 = hash_value(sequence, wordsize)
+        hash2 = hash_value(sequence, wordsize)
+        assert hash1 == hash2, "Same sequences should produce same hashes"
 
-    @given(st.booleans())
-    @settings(max_examples=10)
+    # A boolean has only two values, so both are checked once instead of drawn repeatedly
+    @pytest.mark.parametrize("iupac_mode", [False, True])
     def test_iupac_tables_consistency(self, iupac_mode):
         """Test IUPAC table initialization consistency."""
         tables = init_iupac_tables(iupac_mode)
@@ -296,6 +302,17 @@ class TestPropertyBasedCLI:
             pass
 
 
+@pytest.fixture(scope="module")
+def compare_engine():
+    """One engine reused by every comparison example.
+
+    ``_compare_seqs`` reads the mismatch settings on each call, so examples
+    only set them instead of building a new engine, and restore the defaults
+    afterwards so no example depends on the ones before it.
+    """
+    return MerPCR()
+
+
 class TestPropertyBasedSequenceComparison:
     """Property-based tests for sequence comparison."""
 
@@ -307,9 +324,14 @@ class TestPropertyBasedSequenceComparison:
         integers(min_value=0, max_value=3),
     )
     @settings(max_examples=30)
-    def test_compare_seqs_properties(self, seq1, seq2, strand, mismatches, three_prime_match):
+    def test_compare_seqs_properties(
+        self, compare_engine, seq1, seq2, strand, mismatches, three_prime_match
+    ):
         """Test sequence comparison properties."""
-        engine = MerPCR(mismatches=mismatches, three_prime_match=three_prime_match)
+        engine = compare_engine
+        defaults = engine.mismatches, engine.three_prime_match
+        engine.mismatches = mismatches
+        engine.three_prime_match = three_prime_match
 
         try:
             result = engine._compare_seqs(seq1, seq2, strand)
@@ -332,6 +354,8 @@ class TestPropertyBasedSequenceComparison:
         except Exception:
             # May fail for invalid inputs
             pass
+        finally:
+            engine.mismatches, engine.three_prime_match = defaults
 
 
 class TestPropertyBasedSearch:
@@ -353,22 +377,15 @@ class TestPropertyBasedSearch:
         test_sequence = "".join(random.choices("ATCG", k=500))
         fasta_content = f">test_seq\n{test_sequence}"
 
-        # Create temporary files
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write("\n".join(sts_lines))
-            sts_path = sts_f.name
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
+        sts_content = "\n".join(sts_lines)
 
         try:
             engine = MerPCR(wordsize=8, margin=100)
 
             # Test should complete without crashing
-            success = engine.load_sts_file(sts_path)
+            success = engine.load_sts_file(io.StringIO(sts_content))
             if success:
-                records = engine.load_fasta_file(fasta_path)
+                records = engine.load_fasta_file(io.StringIO(fasta_content))
                 if records:
                     hit_count = engine.search(records)
 
@@ -378,11 +395,8 @@ class TestPropertyBasedSearch:
                     assert engine.total_hits == hit_count
 
         except Exception as e:
-            # Search might fail due to file issues, which is acceptable
+            # Generated data might be rejected by the loaders, which is acceptable
             pass
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
 
 
 @pytest.mark.slow
@@ -405,30 +419,19 @@ class TestPropertyBasedLarge:
 
         fasta_content = f">large_seq\n{'ATCG' * 1000}"  # 4KB sequence
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".sts", delete=False) as sts_f:
-            sts_f.write("\n".join(sts_lines))
-            sts_path = sts_f.name
+        sts_content = "\n".join(sts_lines)
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".fa", delete=False) as fasta_f:
-            fasta_f.write(fasta_content)
-            fasta_path = fasta_f.name
+        engine = MerPCR(wordsize=8, margin=50)
 
-        try:
-            engine = MerPCR(wordsize=8, margin=50)
-
-            success = engine.load_sts_file(sts_path)
-            assert success  # Should be able to load valid data
+        success = engine.load_sts_file(io.StringIO(sts_content))
+        assert success  # Should be able to load valid data
 
-            # Should have loaded the expected number of STS records
-            assert len(engine.sts_records) > 0  # Some might be filtered out
+        # Should have loaded the expected number of STS records
+        assert len(engine.sts_records) > 0  # Some might be filtered out
 
-            records = engine.load_fasta_file(fasta_path)
-            assert len(records) == 1
+        records = engine.load_fasta_file(io.StringIO(fasta_content))
+        assert len(records) == 1
 
-            # Search should complete
-            hit_count = engine.search(records)
-            assert hit_count >= 0
-
-        finally:
-            os.unlink(sts_path)
-            os.unlink(fasta_path)
+        # Search should complete
+        hit_count = engine.search(records)
+        assert hit_count >= 0
@@ -2,10 +2,14 @@
 Comprehensive tests for utility functions with full coverage.
 """
 
+import itertools
+
 import pytest
 
-from merpcr.core.utils import (AMBIG, _compl, _scode, hash_value,
-                               init_iupac_tables, reverse_complement)
+from merpcr.core.utils import (AMBIG, _compl, _compl_codes, _scode,
+                               encode_sequence, find_words, hash_value,
+                               hash_words, init_iupac_tables,
+                               reverse_complement)
 
 
 class TestReverseComplement:
@@ -52,6 +56,7 @@ class TestReverseComplement:
         assert reverse_complement("Z") == "N"  # Unknown -> N
         assert reverse_complement("*") == "N"
         assert reverse_complement("1") == "N"
+        assert reverse_complement("Aé") == "NT"  # Non-ASCII -> N
 
     def test_empty_string(self):
         """Test empty string handling."""
@@ -113,47 +118,43 @@ class TestHashValue:
         assert offset1 == offset2
         assert hash1 == hash2
 
-    def test_different_wordsizes(self):
+    @pytest.mark.parametrize("wordsize", [3, 4, 5, 6, 7, 8, 9])
+    def test_different_wordsizes(self, wordsize):
         """Test different word sizes."""
         primer = "ATCGATCG"
 
-        # Test various word sizes
-        for wordsize in [3, 4, 5, 6, 7, 8]:
-            offset, hash_val = hash_value(primer, wordsize)
-            if wordsize <= len(primer):
-                assert offset >= 0
-                assert hash_val > 0
-            else:
-                assert offset == -1
+        offset, hash_val = hash_value(primer, wordsize)
+        if wordsize <= len(primer):
+            assert offset >= 0
+            assert hash_val > 0
+        else:
+            assert offset == -1
 
     def test_hash_uniqueness(self):
-        """Test that different sequences produce different hashes."""
-        primers = ["ATCG", "GCTA", "TTTT", "AAAA", "CGCG"]
-        hashes = []
-
-        for primer in primers:
-            offset, hash_val = hash_value(primer, 4)
-            if offset >= 0:
-                hashes.append(hash_val)
+        """Test that every 4-mer gets its own hash, its 2-bit packed value."""
+        kmers = ["".join(bases) for bases in itertools.product("ACGT", repeat=4)]
+        results = [hash_value(kmer, 4) for kmer in kmers]
 
-        # All valid hashes should be unique for these sequences
-        assert len(hashes) == len(set(hashes))
+        assert {offset for offset, _ in results} == {0}
+        # product() yields the 4-mers in ACGT order, so the i-th packs to i
+        assert [hash_val for _, hash_val in results] == list(range(256))
 
-    def test_ambiguous_bases_skipped(self):
-        """Test that ambiguous bases are properly skipped."""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "primer,wordsize,expected_offset",
+        [
             ("NATCG", 3, 1),  # Skip N at start
             ("ATNCG", 3, -1),  # N in middle, no valid hash
             ("ATCGN", 3, 0),  # N at end, hash at start
             ("RATCG", 3, 1),  # Skip R (ambiguous)
-        ]
-
-        for primer, wordsize, expected_offset in test_cases:
-            offset, hash_val = hash_value(primer, wordsize)
-            if expected_offset == -1:
-                assert offset == -1
-            else:
-                assert offset >= expected_offset
+        ],
+    )
+    def test_ambiguous_bases_skipped(self, primer, wordsize, expected_offset):
+        """Test that ambiguous bases are properly skipped."""
+        offset, hash_val = hash_value(primer, wordsize)
+        if expected_offset == -1:
+            assert offset == -1
+        else:
+            assert offset >= expected_offset
 
     def test_boundary_conditions(self):
         """Test boundary conditions."""
@@ -181,62 +182,113 @@ class TestHashValue:
         assert hash_val == expected_hash
 
 
+class TestFindWords:
+    """Tests for locating hash words with str.find."""
+
+    @pytest.mark.parametrize(
+        "sequence",
+        [
+            "ATCGATCGNNATCGATCGatcgaucgATCG",
+            "AAAAAAAAAA",  # Overlapping occurrences
+            "ACGUACGUacgt-ACGT",
+            "ACGT\u00dfACGTACGT",  # Non-ASCII falls back to hashing every window
+            "",
+        ],
+    )
+    def test_matches_filtered_hash_words(self, sequence):
+        """Test find_words agrees with hash_words restricted to the wanted hashes."""
+        wanted = {hash_value(word, 4)[1] for word in ("ATCG", "CGAT", "AAAA", "ACGT", "GTAC")}
+
+        expected = [(offset, h) for offset, h in hash_words(sequence, 4) if h in wanted]
+
+        assert find_words(sequence, wanted, 4) == expected
+
+
+class TestEncodeSequence:
+    """Tests for 2-bit sequence packing."""
+
+    def test_basic_encoding(self):
+        """Test that bases pack most significant first."""
+        assert encode_sequence("A") == 0
+        assert encode_sequence("T") == 3
+        assert encode_sequence("ACGT") == (0 << 6) | (1 << 4) | (2 << 2) | 3
+
+    def test_case_insensitive(self):
+        """Test lowercase bases encode like uppercase."""
+        assert encode_sequence("acgt") == encode_sequence("ACGT")
+
+    def test_matches_hash_value(self):
+        """Test packing agrees with the hash of a full-length word."""
+        primer = "GCTAAAAATAC"
+        assert encode_sequence(primer) == hash_value(primer, len(primer))[1]
+
+    def test_unencodable_sequences(self):
+        """Test sequences outside A/C/G/T cannot be packed."""
+        assert encode_sequence("") == -1
+        assert encode_sequence("ACNT") == -1
+        assert encode_sequence("ACGU") == -1
+        assert encode_sequence("0123") == -1
+        assert encode_sequence("A\u0663") == -1  # ARABIC-INDIC DIGIT THREE
+        assert encode_sequence("A\u0664") == -1
+
+
 class TestIUPACTables:
     """Comprehensive tests for IUPAC table initialization."""
 
+    @pytest.fixture(scope="class")
+    def iupac_tables(self):
+        """The IUPAC tables, built once for the class; tests must not modify them."""
+        return init_iupac_tables(True)
+
     def test_iupac_disabled(self):
         """Test when IUPAC mode is disabled."""
         tables = init_iupac_tables(False)
         assert tables == {}
 
-    def test_iupac_enabled(self):
+    def test_iupac_enabled(self, iupac_tables):
         """Test when IUPAC mode is enabled."""
-        tables = init_iupac_tables(True)
-        assert len(tables) > 0
+        assert len(iupac_tables) > 0
 
         # Check standard bases
-        assert tables["A"] == "A"
-        assert tables["C"] == "C"
-        assert tables["G"] == "G"
-        assert tables["T"] == "TU"
-        assert tables["U"] == "TU"
-
-    def test_iupac_ambiguous_codes(self):
+        assert iupac_tables["A"] == "A"
+        assert iupac_tables["C"] == "C"
+        assert iupac_tables["G"] == "G"
+        assert iupac_tables["T"] == "TU"
+        assert iupac_tables["U"] == "TU"
+
+    @pytest.mark.parametrize(
+        "code,bases",
+        [
+            ("R", "AG"),  # R = A or G
+            ("Y", "CT"),  # Y = C or T
+            ("M", "AC"),  # M = A or C
+        ],
+    )
+    def test_iupac_ambiguous_codes(self, iupac_tables, code, bases):
         """Test IUPAC ambiguous code mappings."""
-        tables = init_iupac_tables(True)
+        for base in bases:
+            assert base in iupac_tables[code]
 
-        # Test ambiguous codes
-        assert "A" in tables["R"]  # R = A or G
-        assert "G" in tables["R"]
-        assert "C" in tables["Y"]  # Y = C or T
-        assert "T" in tables["Y"]
-        assert "A" in tables["M"]  # M = A or C
-        assert "C" in tables["M"]
-
-    def test_iupac_case_handling(self):
+    def test_iupac_case_handling(self, iupac_tables):
         """Test case handling in IUPAC tables."""
-        tables = init_iupac_tables(True)
-
         # Test that both upper and lower case are present
-        assert "A" in tables
-        assert "a" in tables
-        assert tables["A"] == tables["a"]
+        assert "A" in iupac_tables
+        assert "a" in iupac_tables
+        assert iupac_tables["A"] == iupac_tables["a"]
 
-        assert "R" in tables
-        assert "r" in tables
-        assert tables["R"] == tables["r"]
+        assert "R" in iupac_tables
+        assert "r" in iupac_tables
+        assert iupac_tables["R"] == iupac_tables["r"]
 
-    def test_iupac_complex_codes(self):
+    def test_iupac_complex_codes(self, iupac_tables):
         """Test complex IUPAC codes."""
-        tables = init_iupac_tables(True)
-
         # Test that complex codes contain expected bases
-        assert "C" in tables["B"]  # B = C, G, T
-        assert "G" in tables["B"]
-        assert "T" in tables["B"]
+        assert "C" in iupac_tables["B"]  # B = C, G, T
+        assert "G" in iupac_tables["B"]
+        assert "T" in iupac_tables["B"]
 
-        assert "N" in tables["N"]  # N = any base
-        assert len(tables["N"]) > 10  # Should contain many bases
+        assert "N" in iupac_tables["N"]  # N = any base
+        assert len(iupac_tables["N"]) > 10  # Should contain many bases
 
 
 class TestScodeLookupTable:
@@ -257,57 +309,38 @@ class TestScodeLookupTable:
 
     def test_scode_ambiguous_mapping(self):
         """Test that ambiguous bases map to AMBIG."""
-        ambiguous_bases = ["R", "Y", "M", "K", "S", "W", "B", "D", "H", "V", "N"]
-        for base in ambiguous_bases:
-            assert _scode[ord(base)] == AMBIG
-            assert _scode[ord(base.lower())] == AMBIG
+        assert {_scode[code] for code in b"RYMKSWBDHVNrymkswbdhvn"} == {AMBIG}
 
     def test_scode_unknown_chars(self):
-        """Test that unknown characters map to AMBIG."""
-        unknown_chars = ["Z", "X", "*", "1", "@"]
-        for char in unknown_chars:
-            assert _scode[ord(char)] == AMBIG
+        """Test that every byte other than a nucleotide maps to AMBIG."""
+        assert len(_scode) == 256
+        others = {code for i, code in enumerate(_scode) if i not in b"ACGTUacgtu"}
+        assert others == {AMBIG}
 
 
 class TestComplLookupTable:
     """Test the internal _compl lookup table."""
 
-    def test_compl_basic_mapping(self):
-        """Test basic complement mappings."""
-        assert _compl["A"] == "T"
-        assert _compl["T"] == "A"
-        assert _compl["C"] == "G"
-        assert _compl["G"] == "C"
-        assert _compl["U"] == "A"
-
-    def test_compl_case_mapping(self):
-        """Test case-sensitive complement mappings."""
-        assert _compl["a"] == "t"
-        assert _compl["t"] == "a"
-        assert _compl["c"] == "g"
-        assert _compl["g"] == "c"
-        assert _compl["u"] == "a"
-
-    def test_compl_ambiguous_mapping(self):
-        """Test ambiguous base complement mappings."""
-        expected_complements = {
-            "R": "Y",
-            "Y": "R",
-            "M": "K",
-            "K": "M",
-            "S": "S",
-            "W": "W",
-            "B": "V",
-            "V": "B",
-            "D": "H",
-            "H": "D",
-            "N": "N",
-            "X": "X",
-        }
-
-        for base, complement in expected_complements.items():
-            assert _compl[base] == complement
-            assert _compl[base.lower()] == complement.lower()
+    @pytest.mark.parametrize(
+        "bases,complements",
+        [
+            ("ACGTU", "TGCAA"),
+            ("acgtu", "tgcaa"),
+            ("RYMKSWBDHVNX", "YRKMSWVHDBNX"),
+            ("rymkswbdhvnx", "yrkmswvhdbnx"),
+        ],
+        ids=["basic", "lowercase", "ambiguous", "ambiguous_lowercase"],
+    )
+    def test_compl_translation(self, bases, complements):
+        """Test complements through _compl and the byte table reverse_complement uses."""
+        assert bases.translate(str.maketrans(_compl)) == complements
+        assert bases.encode().translate(_compl_codes) == complements.encode()
+
+    def test_compl_codes_match_compl(self):
+        """Test the byte table agrees with _compl and maps everything else to N."""
+        for code in range(256):
+            expected = _compl.get(chr(code), "N")
+            assert chr(_compl_codes[code]) == expected, chr(code)
 
 
 class TestUtilsIntegration: